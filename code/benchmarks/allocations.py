@@ -0,0 +1,102 @@
+# Steady-state allocation check for the gameplay frame loop.
+# Runs the same per-frame work as main.py (fixed-step update, draw,
+# present, profiler) headless, then compares tracemalloc snapshots and
+# counts garbage collections over the measured frames.
+# Run from the code/ directory: python -m benchmarks.allocations [--frames N]
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+pygame.init()
+
+from core.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+from core.assets import game_assets
+from core.obstacles import draw_obstacles
+from core.simulation import GameSim, SIM_STEP_MS
+from core.policies import JumperPolicy
+from core.renderer import FrameRenderer
+from core.profiler import profiler
+from core.over_ui import GameOverUI
+from core.ui import UI
+
+# Net growth allowed over the whole measured run (interpreter caches,
+# freelists settling); anything per-frame shows up as a multiple of FRAMES
+SLACK_BYTES = 4096
+
+def run_frames(sim, policy, ui, game_over_ui, renderer, frames):
+    for _ in range(frames):
+        with profiler.scope("update"):
+            sim.step(policy(sim), SIM_STEP_MS)
+        if sim.game_over:
+            # Game over screen for a frame, then straight back in
+            renderer.mark_all(game_over_ui.draw(SCREEN, sim.score))
+            sim.reset(sim.seed + 1)
+        alpha = sim.alpha
+        with profiler.scope("draw"):
+            if sim.background.draw(SCREEN, alpha):
+                renderer.invalidate()
+            renderer.mark(sim.player.draw(SCREEN, alpha))
+            renderer.mark_all(draw_obstacles(SCREEN, sim.obstacles, alpha))
+            renderer.mark(ui.draw_score(SCREEN, sim.score))
+        renderer.mark(profiler.draw_overlay(SCREEN))
+        with profiler.scope("flip"):
+            renderer.present()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--warmup", type=int, default=1200)
+    parser.add_argument("--top", type=int, default=10, help="allocation sites to list")
+    args = parser.parse_args(argv)
+
+    game_assets.load()
+    profiler.enable(True)
+    sim = GameSim(seed=1)
+    policy = JumperPolicy()
+    ui = UI()
+    game_over_ui = GameOverUI()
+    renderer = FrameRenderer()
+
+    # Warm up: fills caches, pools and ring buffers, grows storage to size
+    run_frames(sim, policy, ui, game_over_ui, renderer, args.warmup)
+
+    collections = [0, 0, 0]
+    def on_gc(phase, info):
+        if phase == "start":
+            collections[info["generation"]] += 1
+
+    gc.collect()
+    tracemalloc.start(1)
+    before = tracemalloc.take_snapshot()
+    gc.callbacks.append(on_gc)
+    run_frames(sim, policy, ui, game_over_ui, renderer, args.frames)
+    gc.callbacks.remove(on_gc)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+    growth = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+
+    print(f"{args.frames} frames: net {growth:+d} B in {blocks:+d} blocks "
+          f"({growth / args.frames:+.1f} B/frame), gc collections per generation {collections}")
+    for stat in stats[:args.top]:
+        if stat.size_diff:
+            print(f"  {stat}")
+    ok = growth <= SLACK_BYTES and collections == [0, 0, 0]
+    print("OK" if ok else "FAIL: steady-state frames allocate")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
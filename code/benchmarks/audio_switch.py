@@ -0,0 +1,107 @@
+# Music switches must not add frame-time spikes.
+# Runs a 60 Hz frame loop from the moment the audio loader starts, making
+# the calls main.py makes: a music switch every `--every` frames (as on
+# game over / restart), pause and unpause, and sound effects, and
+# update() each frame. The frames that overlap the background decoding
+# make every one of those calls each frame, since that's when a mixer
+# call would block. Times the audio calls of every frame and fails when
+# any frame's audio work exceeds the spike threshold.
+# Run from the code/ directory: python -m benchmarks.audio_switch [--frames N]
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+pygame.init()
+pygame.mixer.init()
+
+from core.audio import AudioManager
+from core.settings import BASE_DIR, ASSETS_PATH, AUDIO_SETTINGS
+
+FRAME_MS = 1000 / 60
+SPIKE_MS = 2.0 # Audio work allowed per frame
+
+def tracks():
+    # The game's music; a missing file is stood in for by one that exists,
+    # so there are always two tracks to switch between
+    paths = {"intro": os.path.join(BASE_DIR, "../assets/intro.mp3"),
+             "game": os.path.join(BASE_DIR, "../assets/game_audio.mp3")}
+    existing = [path for path in paths.values() if os.path.exists(path)]
+    if not existing:
+        return {}
+    return {name: path if os.path.exists(path) else existing[0] for name, path in paths.items()}
+
+def run(audio, frames, every):
+    # Per-frame audio time (ms), the frames that switched tracks, and how
+    # many frames ran while the loader was still decoding
+    times = []
+    switches = []
+    decoding = 0
+    names = ("game", "intro")
+    for frame in range(frames):
+        loading = audio.loading
+        decoding += loading
+        start = time.perf_counter_ns()
+        if frame % every == 0 or loading:
+            # While decoding, every frame: that's when a call could block
+            audio.play_music(names[len(switches) % 2])
+            switches.append(frame)
+        if frame % every == every // 2 or loading:
+            audio.play_effect("collision")
+        if frame % 7 == 0:
+            audio.play_effect("spawn")
+        if frame % every == every // 4 or (loading and frame % 2):
+            audio.pause()
+        if frame % every == every // 4 + 3 or (loading and not frame % 2):
+            audio.unpause()
+        audio.update()
+        elapsed = time.perf_counter_ns() - start
+        times.append(elapsed / 1e6)
+        # Rest of the frame
+        time.sleep(max(0.0, FRAME_MS / 1000 - elapsed / 1e9))
+    return times, switches, decoding
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--every", type=int, default=60, help="frames between music switches")
+    parser.add_argument("--spike-ms", type=float, default=SPIKE_MS)
+    args = parser.parse_args(argv)
+
+    music = tracks()
+    if not music or pygame.mixer.get_init() is None:
+        print("no music files or no audio device; nothing to measure")
+        return 0
+    effects = {name: os.path.join(ASSETS_PATH, filename) for name, filename in AUDIO_SETTINGS["effects"].items()}
+    audio = AudioManager(music, effects,
+                         sfx_channels=AUDIO_SETTINGS["sfx_channels"], crossfade_ms=AUDIO_SETTINGS["crossfade_ms"])
+    audio.start_loading(first="intro")
+    start = time.perf_counter()
+    times, switches, decoding = run(audio, args.frames, args.every)
+    elapsed = time.perf_counter() - start
+    if audio.loading:
+        print("warning: the loader was still decoding at the end; raise --frames")
+
+    switch_times = [times[frame] for frame in switches]
+    switched = set(switches)
+    other = [t for frame, t in enumerate(times) if frame not in switched]
+    worst = max(range(len(times)), key=times.__getitem__)
+    print(f"{len(times)} frames over {elapsed:.1f} s ({decoding} while decoding), {len(switches)} music switches")
+    print(f"  switch frames: median {statistics.median(switch_times):.3f} ms, max {max(switch_times):.3f} ms")
+    print(f"  other frames:  median {statistics.median(other):.3f} ms, max {max(other):.3f} ms")
+    print(f"  worst frame {worst}: {times[worst]:.3f} ms (threshold {args.spike_ms} ms)")
+    spikes = [frame for frame, t in enumerate(times) if t > args.spike_ms]
+    if spikes:
+        print(f"FAIL: {len(spikes)} frames over {args.spike_ms} ms: {spikes[:10]}")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+# Per-frame cost of rect-only vs precise (mask) collision.
+# Run from the code/ directory: python -m benchmarks.collision_modes
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+from core.assets import game_assets
+from core.obstacles import ObstacleStore, create_obstacle
+from core.collision import check_collision
+from core.player import Player
+from core.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+FRAMES = 2000
+
+def make_scene(count, seed=0):
+    random.seed(seed)
+    obstacles = ObstacleStore()
+    for _ in range(count):
+        slot = create_obstacle(obstacles, random.randint(0, SCREEN_WIDTH))
+        # Scatter over the screen so some of them overlap the player
+        obstacles.x[slot] = random.uniform(0, SCREEN_WIDTH)
+        obstacles.y[slot] = random.uniform(0, SCREEN_HEIGHT)
+    return obstacles
+
+def make_players():
+    # One player per animation frame so every mask gets exercised
+    players = []
+    for surface in [game_assets.standing_surface] + game_assets.run_frames + game_assets.roll_frames + game_assets.jump_frames:
+        player = Player()
+        player.current_img = surface
+        player.rect = surface.get_rect(center=(random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT)))
+        players.append(player)
+    return players
+
+def run(count, precise):
+    obstacles = make_scene(count)
+    players = make_players()
+    hits = 0
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        player = players[frame % len(players)]
+        hits += check_collision(player, obstacles, precise=precise)
+    elapsed = time.perf_counter() - start
+    return elapsed / FRAMES * 1e6, hits
+
+def main():
+    game_assets.load()
+    print(f"{'obstacles':>10} {'mode':>8} {'us/frame':>10} {'hits':>6}")
+    for count in (4, 32, 256, 2048):
+        for precise in (False, True):
+            us, hits = run(count, precise)
+            mode = "precise" if precise else "rect"
+            print(f"{count:>10} {mode:>8} {us:>10.2f} {hits:>6}")
+
+if __name__ == "__main__":
+    main()
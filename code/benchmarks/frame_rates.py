@@ -0,0 +1,112 @@
+# Frame-rate independence and pacing jitter.
+# 1. Runs the same game (seed and per-tick inputs) through GameSim.step
+#    with the frame times of 30, 60, 120 and 144 Hz and of a jittery
+#    uncapped loop, and checks every tick's state is identical.
+# 2. Measures each pacing mode's frame time mean and jitter per target.
+# Run from the code/ directory: python -m benchmarks.frame_rates [--seconds S]
+import argparse
+import hashlib
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+pygame.init()
+
+from core.assets import game_assets
+from core.simulation import GameSim, INPUT_UP, INPUT_RIGHT, INPUT_LEFT
+from core.pacing import FramePacer, PACING_MODES, PACING_TARGETS
+
+RATES = (30, 60, 120, 144)
+TICKS = 3600 # One minute of game time
+
+def tick_inputs(seed, ticks):
+    # Keys held for an even number of ticks: at 30 Hz two ticks share a
+    # frame (and its inputs), so changes must fall on frame boundaries
+    rng = random.Random(seed)
+    inputs = []
+    while len(inputs) < ticks:
+        mask = rng.choice((0, 0, INPUT_UP, INPUT_UP | INPUT_RIGHT, INPUT_RIGHT, INPUT_LEFT))
+        inputs.extend([mask] * (2 * rng.randint(3, 30)))
+    return inputs[:ticks]
+
+def state_digest(sim):
+    player = sim.player
+    n = sim.obstacles.count
+    digest = hashlib.md5(repr((player.state, player.y_position, player.vel_y, player.rect and tuple(player.rect),
+                                sim.score, sim.background.distance)).encode())
+    for arr in (sim.obstacles.x, sim.obstacles.y, sim.obstacles.type_id):
+        digest.update(arr[:n].tobytes())
+    return digest.hexdigest()
+
+class TickLog:
+    # GameSim recorder hook: called before every tick, so it sees the
+    # state each previous tick left behind
+    def __init__(self, sim):
+        self.sim = sim
+        self.digests = []
+
+    def record(self, inputs):
+        self.digests.append(state_digest(self.sim))
+
+def trajectory(seed, inputs, frame_times):
+    # Per-tick states of a run driven through GameSim.step() with frames
+    # of frame_times() ms, sampling the tick's inputs once per frame
+    sim = GameSim(seed=seed, precise=False)
+    log = sim.recorder = TickLog(sim)
+    while sim.tick_count < len(inputs) and not sim.game_over:
+        sim.step(inputs[sim.tick_count], frame_times())
+    log.record(None)
+    return log.digests
+
+def check_trajectories(seeds):
+    ok = True
+    for seed in seeds:
+        inputs = tick_inputs(seed, TICKS)
+        runs = {f"{rate} Hz": (lambda period=1000.0 / rate: period) for rate in RATES}
+        jitter = random.Random(seed)
+        runs["uncapped"] = lambda: jitter.uniform(1.0, 8.0)
+        results = {name: trajectory(seed, inputs, frame_times) for name, frame_times in runs.items()}
+        reference = results["60 Hz"]
+        for name, digests in results.items():
+            same = digests == reference
+            ok &= same
+            print(f"seed {seed} {name:>9}: {len(digests)} ticks {'identical' if same else 'DIFFERENT'}")
+    return ok
+
+def measure_pacing(seconds):
+    print(f"{'mode':>8} {'target':>8} {'mean ms':>8} {'stdev ms':>9} {'max ms':>8} {'late':>5}")
+    for mode in PACING_MODES:
+        if mode == "vsync":
+            continue # Needs a real display
+        for target in PACING_TARGETS:
+            pacer = FramePacer(target, mode)
+            pacer.tick()
+            frames = []
+            end = time.perf_counter() + seconds
+            while time.perf_counter() < end:
+                frames.append(pacer.tick())
+            label = f"{target} Hz" if target else "uncapped"
+            print(f"{mode:>8} {label:>8} {statistics.mean(frames):>8.3f} {statistics.pstdev(frames):>9.3f} "
+                  f"{max(frames):>8.3f} {pacer.late_frames:>5}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Frame-rate independence and pacing jitter")
+    parser.add_argument("--seeds", type=int, default=3)
+    parser.add_argument("--seconds", type=float, default=1.0, help="per pacing mode and target")
+    args = parser.parse_args(argv)
+
+    game_assets.load()
+    ok = check_trajectories(range(1, args.seeds + 1))
+    measure_pacing(args.seconds)
+    print("OK" if ok else "FAIL: trajectories depend on the frame rate")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
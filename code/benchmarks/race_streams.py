@@ -0,0 +1,93 @@
+# Ghost racing: every racer must get the same obstacles however they play.
+# Plays one race announcement (through the wire format) with several
+# input policies -- idle, rolling (scroll boost), jumping -- and checks
+# every spawn (tick, type, velocity, position) matches. Collisions are
+# ignored so each run goes the distance and crosses several score ramps.
+# Also reports whether the configured schedule, with its score ramp,
+# would have kept the streams together.
+# Run from the code/ directory: python -m benchmarks.race_streams [--seconds S]
+import argparse
+import os
+import random
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+pygame.init()
+
+from core.assets import game_assets
+from core.config import config_service
+from core.net import Race, RACE, new_race, split_records
+from core.simulation import GameSim, INPUT_UP, INPUT_RIGHT, INPUT_LEFT
+from core.telemetry import SPAWN
+
+def idle(rng):
+    return 0
+
+def rolling(rng):
+    # Mostly rolling: the roll scroll boost scores obstacles fastest
+    return INPUT_RIGHT if rng.random() < 0.9 else 0
+
+def jumping(rng):
+    return rng.choice((0, INPUT_UP, INPUT_UP, INPUT_LEFT))
+
+POLICIES = (idle, rolling, jumping)
+
+class SpawnLog:
+    # GameSim telemetry hook keeping SPAWN records, taken as each obstacle
+    # is created (before the tick moves it)
+    def __init__(self):
+        self.spawns = []
+
+    def session_start(self, sim):
+        pass
+
+    def emit(self, kind, *values):
+        if kind == SPAWN:
+            self.spawns.append(values)
+
+def spawn_stream(race, policy, ticks, seed=0):
+    # (tick, type, vx, vy, x, y) per spawn, and the final score
+    sim = GameSim(race.settings, seed=race.seed, schedule=race.schedule)
+    sim.telemetry = log = SpawnLog()
+    rng = random.Random(seed)
+    for _ in range(ticks):
+        sim.tick(policy(rng))
+        sim.game_over = False
+    return log.spawns, sim.score
+
+def same_streams(race, ticks):
+    streams = [spawn_stream(race, policy, ticks, i) for i, policy in enumerate(POLICIES)]
+    for policy, (stream, score) in zip(POLICIES, streams):
+        print(f"  {policy.__name__:<8} score {score:>5}, {len(stream)} spawns")
+    first = streams[0][0]
+    return all(stream == first for stream, _ in streams[1:])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=int, default=180, help="game time per run")
+    args = parser.parse_args(argv)
+    ticks = args.seconds * 60
+    game_assets.load()
+
+    tuning = config_service.tuning
+    race = new_race(1, 12345, tuning)
+    # What the clients actually decode
+    (kind, values), = split_records(race.to_bytes())[0]
+    assert kind == RACE
+    race = Race.from_values(values)
+
+    print(f"race ({tuning.difficulty}, {args.seconds} s):")
+    ok = same_streams(race, ticks)
+    print("  identical spawns" if ok else "  SPAWNS DIFFER")
+
+    ramped = Race(1, 12345, tuning.settings, tuning.schedule)
+    print("configured schedule (score ramp), for comparison:")
+    print("  identical spawns" if same_streams(ramped, ticks) else "  spawns differ (expected with a score ramp)")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+# Micro-benchmarks for the game-loop subsystems, run headless against the
+# real modules. Each case times individual calls and reports throughput
+# and p50/p99 latency. --save writes the results as a JSON baseline;
+# later runs are compared with it and fail (exit 1) when a case's
+# throughput drops or its p99 grows past the thresholds.
+# Baselines are machine specific: save one per machine and keep it local.
+# Run from the code/ directory: python -m benchmarks.suite [--save] [-k move]
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+pygame.init()
+
+from core.settings import SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_Y
+
+SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+from core.assets import Assets, game_assets
+from core.background import Background
+from core.collision import check_collision
+from core.intro_ui import IntroUI
+from core.obstacles import ObstacleStore, create_obstacle, move_obstacles
+from core.player import Player
+from core.simulation import InputState, INPUT_UP, INPUT_RIGHT, INPUT_LEFT, SIM_STEP_MS
+from core.ui import UI
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+THRESHOLD = 0.25 # Allowed throughput drop (fraction of the baseline)
+P99_THRESHOLD = 0.5 # Allowed p99 latency growth (fraction of the baseline)
+TIME_BUDGET_S = 0.5 # Per case and repeat, on top of the minimum call count
+
+class Case:
+    # One benchmark: call() is timed, setup() (optional) runs untimed
+    # before every call. items is the work per call (obstacles moved, ...)
+    def __init__(self, name, call, setup=None, calls=2000, items=1, warmup=50):
+        self.name = name
+        self.call = call
+        self.setup = setup
+        self.calls = calls
+        self.items = items
+        self.warmup = warmup
+
+def measure(case):
+    call = case.call
+    setup = case.setup
+    for _ in range(case.warmup):
+        if setup:
+            setup()
+        call()
+    timings = []
+    clock = time.perf_counter_ns
+    deadline = clock() + int(TIME_BUDGET_S * 1e9)
+    while len(timings) < case.calls or (clock() < deadline and len(timings) < case.calls * 10):
+        if setup:
+            setup()
+        start = clock()
+        call()
+        timings.append(clock() - start)
+    timings = np.array(timings, dtype=np.float64) / 1e3 # us
+    return {
+        "calls": len(timings),
+        "ops_per_s": len(timings) / (timings.sum() / 1e6),
+        "items_per_s": len(timings) * case.items / (timings.sum() / 1e6),
+        "p50_us": float(np.percentile(timings, 50)),
+        "p99_us": float(np.percentile(timings, 99)),
+    }
+
+def best_of(results):
+    # Noise only ever makes a run slower: keep each metric's best
+    best = dict(results[0])
+    for result in results[1:]:
+        best["ops_per_s"] = max(best["ops_per_s"], result["ops_per_s"])
+        best["items_per_s"] = max(best["items_per_s"], result["items_per_s"])
+        best["p50_us"] = min(best["p50_us"], result["p50_us"])
+        best["p99_us"] = min(best["p99_us"], result["p99_us"])
+    return best
+
+# --- Cases ---
+
+def make_scene(count, seed=0):
+    # count live obstacles from create_obstacle, scattered over the screen
+    rng = random.Random(seed)
+    obstacles = ObstacleStore()
+    for _ in range(count):
+        slot = create_obstacle(obstacles, rng.randint(0, SCREEN_WIDTH), rng)
+        obstacles.x[slot] = rng.uniform(0, SCREEN_WIDTH)
+        obstacles.y[slot] = rng.uniform(0, GROUND_Y)
+    return obstacles
+
+def move_cases():
+    cases = []
+    for count in (10, 100, 1000, 10000):
+        obstacles = make_scene(count)
+        saved = [arr.copy() for arr in obstacles._arrays()]
+        def restore(obstacles=obstacles, saved=saved, count=count):
+            # Undo the last move (and its culls) so every call sees the same scene
+            for arr, copy in zip(obstacles._arrays(), saved):
+                np.copyto(arr, copy)
+            obstacles.count = count
+        cases.append(Case(f"move_obstacles[{count}]", lambda obstacles=obstacles: move_obstacles(obstacles, 10),
+                          setup=restore, items=count))
+    return cases
+
+def collision_cases():
+    cases = []
+    player = Player()
+    player.reset(0)
+    keys = InputState()
+    player.update(keys, 0)
+    for count in (10, 100, 1000):
+        obstacles = make_scene(count)
+        for precise in (False, True):
+            mode = "precise" if precise else "rect"
+            cases.append(Case(f"check_collision[{count},{mode}]",
+                              lambda o=obstacles, p=precise: check_collision(player, o, precise=p), items=count))
+    return cases
+
+def player_cases():
+    # A held key keeps the player in one state (UP re-jumps on landing)
+    cases = []
+    for state, mask in (("run", 0), ("roll", INPUT_RIGHT), ("jump", INPUT_UP), ("stop", INPUT_LEFT)):
+        player = Player()
+        player.reset(0)
+        keys = InputState(mask)
+        clock = [0.0]
+        def update(player=player, keys=keys, clock=clock):
+            clock[0] += SIM_STEP_MS
+            player.update(keys, clock[0])
+        cases.append(Case(f"player.update[{state}]", update, calls=20000))
+    return cases
+
+def background_cases():
+    background = Background()
+    return [Case("background.update", lambda: background.update(10), calls=20000),
+            Case("background.draw", lambda: (background.update(3), background.draw(SCREEN, 0.5)), calls=500)]
+
+def ui_cases():
+    ui = UI()
+    score = [0]
+    def draw_score():
+        score[0] += 10
+        ui.draw_score(SCREEN, score[0])
+
+    intro = IntroUI()
+    # Points in both slides' animations (ms since the slide started)
+    moments = [(state, t) for state, times in (("title_loading", range(0, intro.s1_duration, 97)),
+                                              ("controls_instruction", range(0, 6000, 97))) for t in times]
+    index = [0]
+    def intro_setup():
+        state, elapsed = moments[index[0] % len(moments)]
+        index[0] += 1
+        intro.state = state
+        intro.start_time = pygame.time.get_ticks() - elapsed
+    return [Case("ui.draw_score", draw_score, calls=5000),
+            Case("intro_ui.draw", lambda: intro.draw(SCREEN), setup=intro_setup, calls=300)]
+
+def cold_load():
+    assets = Assets()
+    try:
+        assets.load()
+    finally:
+        assets.close()
+
+def load_cases():
+    # Cold load into a fresh registry each call (bundle or source images, per config)
+    return [Case("assets.load", cold_load, calls=5, warmup=1)]
+
+def all_cases():
+    game_assets.load()
+    return move_cases() + collision_cases() + player_cases() + background_cases() + ui_cases() + load_cases()
+
+# --- Baselines ---
+
+def machine():
+    return {"platform": platform.platform(), "python": platform.python_version(),
+            "pygame": pygame.version.ver, "numpy": np.__version__, "processor": platform.processor()}
+
+def compare(results, baseline, threshold, p99_threshold):
+    # Returns the list of regressions (case name, reason)
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["ops_per_s"] < base["ops_per_s"] * (1 - threshold):
+            regressions.append((name, f"throughput {result['ops_per_s']:.0f}/s vs {base['ops_per_s']:.0f}/s"))
+        if result["p99_us"] > base["p99_us"] * (1 + p99_threshold):
+            regressions.append((name, f"p99 {result['p99_us']:.1f} us vs {base['p99_us']:.1f} us"))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Game-loop micro-benchmarks")
+    parser.add_argument("-k", dest="pattern", default="*", help="only cases matching this glob")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="write the results as the baseline")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case (best kept)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--p99-threshold", type=float, default=P99_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if not args.save and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            saved = json.load(f)
+        if saved.get("machine") != machine():
+            print(f"note: baseline was recorded on another setup: {saved.get('machine')}")
+        baseline = saved["results"]
+
+    cases = [case for case in all_cases() if fnmatch.fnmatch(case.name, args.pattern)]
+    # Rounds over all cases rather than back-to-back repeats, so a slow
+    # stretch on the machine doesn't land on every run of one case
+    runs = {case.name: [] for case in cases}
+    for _ in range(args.repeat):
+        for case in cases:
+            runs[case.name].append(measure(case))
+
+    print(f"{'case':<32} {'calls/s':>12} {'items/s':>14} {'p50 us':>10} {'p99 us':>10} {'vs base':>8}")
+    results = {}
+    for case in cases:
+        result = results[case.name] = best_of(runs[case.name])
+        base = baseline.get(case.name)
+        change = f"{result['ops_per_s'] / base['ops_per_s'] - 1:+.0%}" if base else "-"
+        print(f"{case.name:<32} {result['ops_per_s']:>12.0f} {result['items_per_s']:>14.0f} "
+              f"{result['p50_us']:>10.2f} {result['p99_us']:>10.2f} {change:>8}")
+
+    if args.save:
+        if os.path.exists(args.baseline):
+            # Keep cases that weren't run this time (-k)
+            with open(args.baseline) as f:
+                results = dict(json.load(f)["results"], **results)
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": machine(), "results": results}, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --save to record one")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold, args.p99_threshold)
+    for name, reason in regressions:
+        print(f"REGRESSION {name}: {reason}")
+    print("FAIL" if regressions else "OK")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import bisect
+import math
+
+# Animation clips with everything a frame change needs worked out up
+# front: frame sizes, anchors and the order frames follow each other in
+# (or the value ranges that pick them), so choosing and placing a frame is
+# a couple of tuple lookups.
+#
+# An anchor is the offset from the owner's position to the frame's center.
+
+def _per_frame(anchor, count):
+    # One (x, y) shared by every frame, or a list with one per frame
+    if anchor and isinstance(anchor[0], (tuple, list)):
+        return tuple(tuple(a) for a in anchor)
+    return (tuple(anchor),) * count
+
+class Clip:
+    # Timed clip: after frame_ms the frame advances to next_frame[index].
+    # loop=(start, end) repeats start..end; an index outside that range
+    # goes to start (clips are entered at start).
+    def __init__(self, frames, frame_ms=0, loop=None, anchor=(0, 0)):
+        self.frames = tuple(frames)
+        count = len(self.frames)
+        self.frame_ms = frame_ms
+        self.sizes = tuple(frame.get_size() for frame in self.frames)
+        self.anchors = _per_frame(anchor, count)
+        start, end = loop if loop is not None else (0, count - 1)
+        self.start = start
+        self.next_frame = tuple(i + 1 if start <= i < end else start for i in range(count))
+
+class ThresholdClip:
+    # Clip keyed by a value instead of time (a jump arc by vertical
+    # velocity): frame i is shown while value < thresholds[i], the frame
+    # after the last threshold from there on. Thresholds are integers, so
+    # the frame for every integer floor of the value is tabulated.
+    def __init__(self, frames, thresholds, anchor=(0, 0)):
+        self.frames = tuple(frames)
+        last = len(self.frames) - 1
+        self.sizes = tuple(frame.get_size() for frame in self.frames)
+        self.anchors = _per_frame(anchor, len(self.frames))
+        thresholds = sorted(thresholds)
+        self.low = thresholds[0] - 1 if thresholds else 0
+        high = thresholds[-1] if thresholds else 0
+        self.table = tuple(min(bisect.bisect_right(thresholds, v), last) for v in range(self.low, high + 1))
+
+    def index(self, value):
+        i = math.floor(value) - self.low
+        if i <= 0:
+            return self.table[0]
+        if i >= len(self.table):
+            return self.table[-1]
+        return self.table[i]
@@ -1,6 +1,9 @@
 import pygame
 import os
-from .settings import ASSETS_PATH, SCREEN_WIDTH, SCREEN_HEIGHT
+import threading
+from .settings import ASSETS_PATH, ASSET_BUNDLE_PATH, SCREEN_WIDTH, SCREEN_HEIGHT, OBSTACLE_ARCHETYPES, BACKGROUND_LAYERS
+from .bundle import open_bundle
+from .atlas import build_atlas
 
 # Initialize pygame display if not already (needed for convert methods usually, but assets might be loaded before init in some structures. 
 # However, pygame.image.load works without display.set_mode, but convert() needs it. 
@@ -25,7 +28,35 @@ from .settings import ASSETS_PATH, SCREEN_WIDTH, SCREEN_HEIGHT
 # I'll verify if `pygame.display.set_mode` is needed for `convert()`. Docs say `convert()` requires a display mode set? Actually yes, usually.
 # So I will define a function `load_all_assets()` that main.py calls after init.
 
-def load_image(filename, scale_size=None, remove_bg=False):
+# name -> (filename, scale size, pixel mode). Modes: "alpha" keeps per-pixel
+# alpha, "colorkey" makes the top-left pixel color transparent, "opaque"
+# drops alpha entirely (backgrounds).
+ASSET_SPECS = {
+    "standing": ("standing.png", (120, 180), "alpha"),
+    "run1": ("runGLeft.png", (160, 200), "alpha"),
+    "run2": ("runGRight.png", (160, 200), "alpha"),
+    **{f"roll{i}": (f"roll{i}.png", (120, 90), "colorkey") for i in range(1, 8)},
+    **{f"jump{i}": (f"jump{i}.png", (130, 185), "alpha") for i in range(1, 6)},
+    "intro_bg": ("intro_bg.jpg", (SCREEN_WIDTH, SCREEN_HEIGHT), "opaque"),
+    "intro_bg2": ("intro_bg2.jpg", (SCREEN_WIDTH, SCREEN_HEIGHT), "opaque"),
+}
+
+# Obstacle sprites come from the archetypes in config.json, one asset per type
+OBSTACLE_ASSETS = list(OBSTACLE_ARCHETYPES)
+if ASSET_SPECS.keys() & OBSTACLE_ARCHETYPES.keys():
+    raise ValueError(f"obstacle types clash with built-in assets: {sorted(ASSET_SPECS.keys() & OBSTACLE_ARCHETYPES.keys())}")
+ASSET_SPECS.update({name: (archetype["sprite"], tuple(archetype["size"]), archetype.get("mode", "alpha"))
+                    for name, archetype in OBSTACLE_ARCHETYPES.items()})
+
+# Parallax background layers, one asset per layer
+BACKGROUND_ASSETS = [layer["name"] for layer in BACKGROUND_LAYERS]
+if ASSET_SPECS.keys() & set(BACKGROUND_ASSETS) or len(set(BACKGROUND_ASSETS)) != len(BACKGROUND_ASSETS):
+    raise ValueError(f"background layer names must be unique and not clash with other assets: {BACKGROUND_ASSETS}")
+ASSET_SPECS.update({layer["name"]: (layer["sprite"], tuple(layer.get("size", (SCREEN_WIDTH, SCREEN_HEIGHT))),
+                                    layer.get("mode", "opaque"))
+                    for layer in BACKGROUND_LAYERS})
+
+def load_image(filename, scale_size=None, remove_bg=False, opaque=False):
     path = os.path.join(ASSETS_PATH, filename)
     try:
         surface = pygame.image.load(path)
@@ -44,47 +75,143 @@ def load_image(filename, scale_size=None, remove_bg=False):
         surface.set_colorkey(colorkey)
     else:
         if pygame.display.get_surface():
-            surface = surface.convert_alpha()
+            surface = surface.convert() if opaque else surface.convert_alpha()
 
     if scale_size:
         surface = pygame.transform.scale(surface, scale_size)
     
     return surface
 
+def load_spec(name):
+    filename, scale_size, mode = ASSET_SPECS[name]
+    return load_image(filename, scale_size, remove_bg=mode == "colorkey", opaque=mode == "opaque")
+
+# Public attribute -> asset name(s); list attributes resolve to lists of surfaces
+ATTRIBUTES = {
+    "standing_surface": "standing",
+    "run_frames": ["run1", "run2"],
+    "roll_frames": [f"roll{i}" for i in range(1, 8)],
+    "jump_frames": [f"jump{i}" for i in range(1, 6)],
+    "background_layers": BACKGROUND_ASSETS, # Back to front
+    "obstacle_images": OBSTACLE_ASSETS, # Indexed by obstacle type id
+    "intro_bg": "intro_bg",
+    "intro_bg2": "intro_bg2",
+}
+
+PLAYER_ASSETS = ["standing", "run1", "run2"] + ATTRIBUTES["roll_frames"] + ATTRIBUTES["jump_frames"]
+
+# Sprite groups packed into one atlas surface each; members resolve to
+# subsurfaces of it (loading any member loads the whole group)
+ATLASES = {
+    "player": PLAYER_ASSETS,
+}
+ATLAS_OF = {name: atlas for atlas, names in ATLASES.items() for name in names}
+
+# Assets each game state draws; the next state's set is prefetched while
+# the current one runs
+STATE_ASSETS = {
+    "intro": ["intro_bg", "intro_bg2"],
+    "playing": BACKGROUND_ASSETS + PLAYER_ASSETS + OBSTACLE_ASSETS,
+    "game_over": BACKGROUND_ASSETS,
+}
+
 class Assets:
+    # Lazy registry: every surface is loaded on first access (from the
+    # bundle when configured, from the source image otherwise) and the
+    # attribute is then cached on the instance, so later reads cost a
+    # plain attribute lookup. Atlas members load as a group.
     def __init__(self):
-        self.standing_surface = None
-        self.run_frames = []
-        self.roll_frames = []
-        self.jump_frames = []
-        self.background = None
-        self.car_img = None
-        self.bird_img = None
-        self.missile_img = None
-        self.bomb_img = None
+        # Collision masks for every sprite loaded so far, keyed by surface
+        self.masks = {}
+        self.atlases = {} # atlas name -> packed surface
+        self._surfaces = {}
+        self._lock = threading.Lock()
+        self._bundle = None
+        self._bundle_opened = False
+
+    def __getattr__(self, attr):
+        names = ATTRIBUTES.get(attr)
+        if names is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {attr!r}")
+        if isinstance(names, list):
+            value = [self.surface(name) for name in names]
+        else:
+            value = self.surface(names)
+        setattr(self, attr, value)
+        return value
+
+    def surface(self, name):
+        surface = self._surfaces.get(name)
+        if surface is None:
+            with self._lock:
+                surface = self._surfaces.get(name)
+                if surface is None:
+                    if name in ATLAS_OF:
+                        self._load_atlas(ATLAS_OF[name])
+                        surface = self._surfaces[name]
+                    else:
+                        surface = self._register(name, self._read(name))
+        return surface
+
+    def _read(self, name):
+        if not self._bundle_opened:
+            # Pre-scaled pixels from the bundle when configured, source images otherwise
+            self._bundle_opened = True
+            if ASSET_BUNDLE_PATH:
+                self._bundle = open_bundle(ASSET_SPECS, ASSETS_PATH, ASSET_BUNDLE_PATH)
+        surface = self._bundle.surface(name) if self._bundle else None
+        if surface is None:
+            surface = load_spec(name)
+        return surface
+
+    def _load_atlas(self, atlas):
+        names = ATLASES[atlas]
+        self.atlases[atlas], frames = build_atlas([self._read(name) for name in names])
+        for name, frame in zip(names, frames):
+            self._register(name, frame)
+
+    def _register(self, name, surface):
+        if ASSET_SPECS[name][2] != "opaque" and name not in BACKGROUND_ASSETS:
+            # Built once per scaled sprite / animation frame so precise
+            # collision never has to create a mask on the hot path
+            self.masks[surface] = pygame.mask.from_surface(surface)
+        self._surfaces[name] = surface
+        return surface
+
+    def is_loaded(self, state):
+        return all(name in self._surfaces for name in STATE_ASSETS[state])
+
+    def prefetch(self, state):
+        # Loads a state's assets on a background thread; returns the thread
+        # (None when everything is already resident)
+        names = [name for name in STATE_ASSETS[state] if name not in self._surfaces]
+        if not names:
+            return None
+        thread = threading.Thread(target=self._prefetch, args=(names,), name=f"prefetch-{state}", daemon=True)
+        thread.start()
+        return thread
+
+    def _prefetch(self, names):
+        for name in names:
+            self.surface(name)
 
     def load(self):
-        self.standing_surface = load_image("standing.png", (120, 180))
-        
-        # Load running animation frames
-        self.run_frames = [
-            load_image("runGLeft.png", (160, 200)),
-            load_image("runGRight.png", (160, 200))
-        ]
-        
-        self.roll_frames = [
-             load_image(f"roll{i}.png", (120, 90), remove_bg=True) for i in range(1, 8)
-        ]
-
-        self.jump_frames = [
-            load_image(f"jump{i}.png", (130, 185)) for i in range(1, 6)
-        ]
-        
-        self.background = load_image("background.jpg", (SCREEN_WIDTH, SCREEN_HEIGHT))
-        
-        self.car_img = load_image("carO.png", (150, 90))
-        self.bird_img = load_image("birdO.png", (100, 70))
-        self.missile_img = load_image("missileO.png", (110, 60))
-        self.bomb_img = load_image("bombO.png", (90, 90))
+        # Everything, synchronously (headless runs, benchmarks)
+        for name in ASSET_SPECS:
+            self.surface(name)
+        for attr in ATTRIBUTES:
+            getattr(self, attr)
+
+    def get_mask(self, surface):
+        return self.masks.get(surface)
+
+    def close(self):
+        # Unmaps the bundle. Loaded surfaces are copies and stay valid; a
+        # later load reopens it.
+        with self._lock:
+            if self._bundle:
+                self._bundle.close()
+            self._bundle = None
+            self._bundle_opened = False
 
 game_assets = Assets()
@@ -0,0 +1,48 @@
+import numpy as np
+import pygame
+
+# Sprite atlas: several sprites packed into one per-pixel-alpha surface and
+# handed out as subsurfaces, so a group of animation frames is one pixel
+# buffer in one format instead of a separate surface (and conversion) each.
+
+def pack(sizes, max_width=2048, padding=1):
+    # Shelf packing, tallest first. Returns (atlas size, [Rect per size]).
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    rects = [None] * len(sizes)
+    x = y = shelf_h = width = 0
+    for i in order:
+        w, h = sizes[i]
+        if x and x + w > max_width:
+            # Next shelf
+            y += shelf_h + padding
+            x = shelf_h = 0
+        rects[i] = pygame.Rect(x, y, w, h)
+        x += w + padding
+        shelf_h = max(shelf_h, h)
+        width = max(width, x - padding)
+    return (width, y + shelf_h), rects
+
+def build_atlas(surfaces, max_width=2048):
+    # Returns (atlas, [subsurface per input surface]). Colorkeyed inputs are
+    # converted to per-pixel alpha; the copies are pixel-exact.
+    size, rects = pack([surface.get_size() for surface in surfaces], max_width)
+    atlas = pygame.Surface(size, pygame.SRCALPHA)
+    atlas.fill((0, 0, 0, 0))
+    for surface, rect in zip(surfaces, rects):
+        if surface.get_colorkey() is not None:
+            surface = surface.convert_alpha() if pygame.display.get_surface() else _keyed_to_alpha(surface)
+        # MAX onto transparent black copies RGBA as is (a plain blit would blend)
+        atlas.blit(surface, rect, special_flags=pygame.BLEND_RGBA_MAX)
+    if pygame.display.get_surface():
+        atlas = atlas.convert_alpha()
+    return atlas, [atlas.subsurface(rect) for rect in rects]
+
+def _keyed_to_alpha(surface):
+    # Headless fallback for convert_alpha(): colorkey pixels transparent,
+    # every other pixel opaque (what the mask and a keyed blit go by)
+    # The key matches whole mapped pixels (alpha included)
+    opaque = pygame.surfarray.array2d(surface) != surface.map_rgb(surface.get_colorkey())
+    out = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+    pygame.surfarray.pixels3d(out)[...] = pygame.surfarray.array3d(surface)
+    pygame.surfarray.pixels_alpha(out)[...] = np.where(opaque, 255, 0)
+    return out
@@ -0,0 +1,132 @@
+import logging
+import os
+import threading
+import pygame
+
+log = logging.getLogger(__name__)
+
+class AudioManager:
+    # Music tracks are decoded to in-memory Sounds on a background thread
+    # and played on two reserved channels, so switching tracks is a
+    # non-blocking crossfade instead of a mixer.music.load() on the main
+    # thread. Sound effects share a pool of the remaining channels.
+    #
+    # SDL_mixer holds its lock while decoding, so any channel call made
+    # while the loader runs would stall the frame until it's done. Until
+    # then, music switches and pause state are recorded and applied by
+    # update(), and sound effects are skipped.
+    MUSIC_CHANNELS = 2
+
+    def __init__(self, tracks, effects=None, sfx_channels=6, crossfade_ms=600):
+        # tracks / effects: name -> file path (missing files are skipped,
+        # with a warning for effects)
+        self.enabled = pygame.mixer.get_init() is not None
+        self.crossfade_ms = crossfade_ms
+        self.paths = {name: path for name, path in tracks.items() if os.path.exists(path)}
+        self.effect_paths = {}
+        for name, path in (effects or {}).items():
+            if os.path.exists(path):
+                self.effect_paths[name] = path
+            else:
+                log.warning("sound effect %r: %s not found, it won't play", name, path)
+        self.tracks = {}
+        self.effects = {}
+        self.current = None # Track playing
+        self.requested = None # Track asked for (differs from current while a switch is deferred)
+        self.active = 0 # Music channel currently audible
+        self.paused = False
+        self.channels_paused = False # Pause state the music channels are actually in
+        self._thread = None
+
+        if self.enabled:
+            pygame.mixer.set_num_channels(self.MUSIC_CHANNELS + sfx_channels)
+            # Reserved channels are never handed out by find_channel(),
+            # which keeps them free for music
+            pygame.mixer.set_reserved(self.MUSIC_CHANNELS)
+            self.music_channels = [pygame.mixer.Channel(i) for i in range(self.MUSIC_CHANNELS)]
+
+    def start_loading(self, first=None):
+        # Decode everything off the main thread, `first` track first
+        if not self.enabled or self._thread is not None:
+            return
+        order = sorted(self.paths, key=lambda name: name != first)
+        self._thread = threading.Thread(target=self._load_all, args=(order,), name="audio-loader", daemon=True)
+        self._thread.start()
+
+    def _load_all(self, order):
+        for name in order:
+            try:
+                self.tracks[name] = pygame.mixer.Sound(self.paths[name])
+            except pygame.error as e:
+                print(f"Error loading music {name}: {e}")
+        for name, path in self.effect_paths.items():
+            try:
+                self.effects[name] = pygame.mixer.Sound(path)
+            except pygame.error as e:
+                print(f"Error loading sound {name}: {e}")
+
+    @property
+    def loading(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def play_music(self, name):
+        # Crossfade to a track; tracks without a file fade the music out
+        if not self.enabled:
+            return
+        self.requested = name
+        if not self.loading:
+            self._switch()
+
+    def update(self):
+        # Call once per frame; applies what was deferred while loading
+        if not self.enabled or self.loading:
+            return
+        if self.paused != self.channels_paused:
+            self._apply_pause()
+        if self.requested != self.current:
+            self._switch()
+
+    def _switch(self):
+        name = self.current = self.requested
+        old = self.music_channels[self.active]
+        sound = self.tracks.get(name)
+        if sound is None:
+            old.fadeout(self.crossfade_ms)
+            return
+        self.active = (self.active + 1) % self.MUSIC_CHANNELS
+        new = self.music_channels[self.active]
+        new.play(sound, loops=-1, fade_ms=self.crossfade_ms)
+        if old.get_busy():
+            old.fadeout(self.crossfade_ms)
+        if self.paused:
+            new.pause()
+
+    def pause(self):
+        if self.enabled:
+            self.paused = True
+            if not self.loading:
+                self._apply_pause()
+
+    def unpause(self):
+        if self.enabled:
+            self.paused = False
+            if not self.loading:
+                self._apply_pause()
+
+    def _apply_pause(self):
+        self.channels_paused = self.paused
+        for channel in self.music_channels:
+            if self.paused:
+                channel.pause()
+            else:
+                channel.unpause()
+
+    def play_effect(self, name):
+        # Effects are moments: one that would have to wait for the loader is dropped
+        sound = self.effects.get(name)
+        if sound is None or self.loading:
+            return
+        # Oldest effect gets cut off when the pool is exhausted
+        channel = pygame.mixer.find_channel(True)
+        if channel is not None:
+            channel.play(sound)
@@ -1,27 +1,96 @@
-from .settings import SCREEN_WIDTH, SCREEN_HEIGHT, SCROLL_SPEED
+import bisect
+import pygame
+from .settings import SCREEN_WIDTH, BACKGROUND_LAYERS, BACKGROUND_TILE_WIDTH
+from .config import config_service
 from .assets import game_assets
 
+class Layer:
+    # One parallax layer, pre-sliced into narrow tiles (subsurfaces, no
+    # pixel copies). Tiles of colorkey/alpha layers are cropped to their
+    # visible pixels and fully transparent ones dropped, so drawing only
+    # touches pixels that show. Opaque layers keep their plain, non-alpha
+    # format and are copied straight to the screen.
+    def __init__(self, surface, factor=1.0, y=0, tile_width=BACKGROUND_TILE_WIDTH):
+        self.factor = factor
+        self.width = surface.get_width()
+        opaque = not (surface.get_flags() & pygame.SRCALPHA) and surface.get_colorkey() is None
+        self.tiles = [] # (x in layer, y on screen, surface), left to right
+        for x in range(0, self.width, tile_width):
+            tile = surface.subsurface((x, 0, min(tile_width, self.width - x), surface.get_height()))
+            top = y
+            if not opaque:
+                bounds = tile.get_bounding_rect()
+                if not bounds.width or not bounds.height:
+                    continue
+                tile = tile.subsurface(bounds)
+                x += bounds.x
+                top += bounds.y
+            self.tiles.append((x, top, tile))
+        self.tile_right = [x + tile.get_width() for x, _, tile in self.tiles]
+
+    def visible(self, offset, out):
+        # Appends (surface, position) for the tiles in view with the layer
+        # scrolled left by offset (the layer repeats every width pixels)
+        tiles = self.tiles
+        if not tiles:
+            return
+        left = offset % self.width
+        base = -left
+        # First tile ending right of the screen's left edge, then across
+        i = bisect.bisect_right(self.tile_right, left)
+        while base < SCREEN_WIDTH:
+            while i < len(tiles):
+                x, y, tile = tiles[i]
+                if base + x >= SCREEN_WIDTH:
+                    return
+                out.append((tile, (int(base + x), y)))
+                i += 1
+            base += self.width
+            i = 0
+
 class Background:
-    def __init__(self):
-        self.image = game_assets.background
-        # Two positions for seamless scrolling
-        self.x1 = 0
-        self.x2 = SCREEN_WIDTH
-        self.speed = SCROLL_SPEED
+    # Parallax layers, back to front, each scrolling at factor times the
+    # ground speed. Scrolling keeps one total distance and derives every
+    # layer's offset from it at draw time, so float factors never
+    # accumulate rounding drift between layers.
+    #
+    # Fill cost is the screen area the layers' visible pixels cover: a
+    # single full-screen opaque layer costs what the old one-image
+    # background did, and depth comes from bands and transparent tiles
+    # that add no blits where they're empty.
+    def __init__(self, layers=BACKGROUND_LAYERS):
+        self.layer_specs = layers
+        self.layers = None # Sliced on first draw so headless simulations never pay for it
+        self.distance = 0.0 # Total ground scroll in pixels
+        self.last_shift = 0 # Distance moved by the last update (render interpolation)
+        self.drawn_at = None # Layer offsets of the last draw, to detect scrolling
+        self.blit_list = [] # Reused for the per-frame blits() call
 
-    def update(self, extra_speed=0):
-        # Move both backgrounds to the left
-        current_speed = self.speed + extra_speed
-        self.x1 -= current_speed
-        self.x2 -= current_speed
+    def _build_layers(self):
+        self.layers = [Layer(surface, spec.get("factor", 1.0), spec.get("y", 0))
+                       for surface, spec in zip(game_assets.background_layers, self.layer_specs)]
 
-        # Check if off-screen (reset to the right of the other image)
-        if self.x1 <= -SCREEN_WIDTH:
-            self.x1 = SCREEN_WIDTH
-        
-        if self.x2 <= -SCREEN_WIDTH:
-            self.x2 = SCREEN_WIDTH
+    def update(self, extra_speed=0):
+        # Scroll left (scroll speed is hot-reloadable)
+        current_speed = config_service.tuning.scroll_speed + extra_speed
+        self.last_shift = current_speed
+        self.distance += current_speed
 
-    def draw(self, screen):
-        screen.blit(self.image, (self.x1, 0))
-        screen.blit(self.image, (self.x2, 0))
+    def draw(self, screen, alpha=1.0):
+        # Returns True when the picture moved since the previous draw
+        if self.layers is None:
+            self._build_layers()
+        # Back towards the previous tick's position when interpolating
+        distance = self.distance - (1.0 - alpha) * self.last_shift
+        blits = self.blit_list
+        drawn_at = []
+        for layer in self.layers:
+            offset = int(distance * layer.factor)
+            drawn_at.append(offset % layer.width)
+            layer.visible(offset, blits)
+        screen.blits(blits, doreturn=False)
+        blits.clear()
+        drawn_at = tuple(drawn_at)
+        moved = drawn_at != self.drawn_at
+        self.drawn_at = drawn_at
+        return moved
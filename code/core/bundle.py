@@ -0,0 +1,232 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import pygame
+
+# Packed asset bundle: every asset already scaled and converted to raw
+# pixels, so startup maps one file and wraps its buffers in surfaces
+# instead of decoding and scaling PNG/JPG files.
+#
+# Layout: header (magic, version, index length), JSON index, then the raw
+# pixel buffers, each aligned to 16 bytes. Index entries record the
+# source file's size, mtime and content hash plus the spec it was built
+# with; only entries whose source or spec changed are rebuilt.
+MAGIC = b"ARBN"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+ALIGN = 16
+
+def _hash_file(path):
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+def _read_index(path):
+    # Index of an existing bundle, or {}. Reads only the header and the
+    # index; the pixel data is never touched here.
+    try:
+        with open(path, "rb") as f:
+            magic, version, index_len = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                return {}
+            return json.loads(f.read(index_len))
+    except (OSError, ValueError, struct.error):
+        return {}
+
+def _map(path):
+    # (file, read-only mmap) of an existing bundle, or (None, None)
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return None, None
+    try:
+        return f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        f.close()
+        return None, None
+
+def _source_stamp(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+def _decode(path, scale_size, mode):
+    # Same pipeline as assets.load_image, minus the display-dependent convert
+    surface = pygame.image.load(path)
+    colorkey = None
+    if mode == "colorkey":
+        colorkey = list(surface.get_at((0, 0)))[:3]
+    if scale_size:
+        surface = pygame.transform.scale(surface, scale_size)
+    fmt = "RGBA" if mode == "alpha" else "RGB"
+    return pygame.image.tobytes(surface, fmt), list(surface.get_size()), fmt, colorkey
+
+def _is_fresh(entry, spec, path):
+    filename, scale_size, mode = spec
+    if entry.get("source") != filename or entry.get("mode") != mode:
+        return False
+    if entry.get("scale") != (list(scale_size) if scale_size else None):
+        return False
+    size, mtime = _source_stamp(path)
+    if entry.get("src_size") == size and entry.get("src_mtime") == mtime:
+        return True
+    # Touched but maybe not changed: fall back to the content hash
+    if entry.get("hash") != _hash_file(path):
+        return False
+    # Same content: take the new stamp, so the next check is the fast path
+    entry["src_size"], entry["src_mtime"] = size, mtime
+    return True
+
+def _rewrite_index(path, index):
+    # Writes an updated index over the old one in place; False if it no
+    # longer fits the space reserved for it
+    try:
+        with open(path, "r+b") as f:
+            magic, version, index_len = HEADER.unpack(f.read(HEADER.size))
+            index_bytes = json.dumps(index).encode()
+            if magic != MAGIC or version != VERSION or len(index_bytes) > index_len:
+                return False
+            f.write(index_bytes + b" " * (index_len - len(index_bytes)))
+        return True
+    except (OSError, struct.error):
+        return False
+
+def is_stale(specs, assets_path, bundle_path):
+    index = _read_index(bundle_path)
+    restamped = False
+    for name, spec in specs.items():
+        path = os.path.join(assets_path, spec[0])
+        if not os.path.exists(path):
+            continue
+        entry = index.get(name)
+        if entry is None:
+            return True
+        stamp = entry.get("src_size"), entry.get("src_mtime")
+        if not _is_fresh(entry, spec, path):
+            return True
+        restamped |= stamp != (entry["src_size"], entry["src_mtime"])
+    if restamped:
+        # Only sources touched without changing: record their new stamps
+        # rather than rebuilding; fall back to a rebuild if that fails
+        return not _rewrite_index(bundle_path, index)
+    return False
+
+def build(specs, assets_path, bundle_path, force=False):
+    # Writes the bundle; returns the names that had to be re-decoded
+    old_index = {} if force else _read_index(bundle_path)
+    # Fresh entries are copied over from the old bundle through a mapping,
+    # so only their pages are read
+    old_file, old_data = _map(bundle_path) if old_index else (None, None)
+    blobs = {}
+    entries = {}
+    rebuilt = []
+    try:
+        for name, spec in specs.items():
+            filename, scale_size, mode = spec
+            path = os.path.join(assets_path, filename)
+            if not os.path.exists(path):
+                continue # load_image's placeholder handles missing files at runtime
+            entry = old_index.get(name)
+            if entry is not None and old_data is not None and _is_fresh(entry, spec, path):
+                blobs[name] = old_data[entry["offset"]:entry["offset"] + entry["length"]]
+                entry = dict(entry)
+            else:
+                pixels, size, fmt, colorkey = _decode(path, scale_size, mode)
+                blobs[name] = pixels
+                entry = {"source": filename, "scale": list(scale_size) if scale_size else None, "mode": mode,
+                         "hash": _hash_file(path), "size": size, "format": fmt, "colorkey": colorkey}
+                rebuilt.append(name)
+            entry["src_size"], entry["src_mtime"] = _source_stamp(path)
+            entry["length"] = len(blobs[name])
+            entries[name] = entry
+    finally:
+        if old_data is not None:
+            old_data.close()
+            old_file.close()
+
+    # Offsets depend on the index length, which depends on the offsets;
+    # settle it by laying out against a generous index reservation
+    index_len = len(json.dumps(entries).encode()) + 64 * len(entries) + 64
+    offset = _align(HEADER.size + index_len)
+    for name, entry in entries.items():
+        entry["offset"] = offset
+        offset = _align(offset + entry["length"])
+    index_bytes = json.dumps(entries).encode()
+    index_bytes += b" " * (index_len - len(index_bytes))
+
+    directory = os.path.dirname(bundle_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = bundle_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, index_len))
+        f.write(index_bytes)
+        for name, entry in entries.items():
+            f.seek(entry["offset"])
+            f.write(blobs[name])
+    os.replace(tmp_path, bundle_path)
+    return rebuilt
+
+class Bundle:
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_len = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} asset bundle")
+        self.index = json.loads(self.map[HEADER.size:HEADER.size + index_len])
+        self.view = memoryview(self.map)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def surface(self, name):
+        entry = self.index.get(name)
+        if entry is None:
+            return None
+        offset = entry["offset"]
+        buffer = self.view[offset:offset + entry["length"]]
+        surface = pygame.image.frombuffer(buffer, tuple(entry["size"]), entry["format"])
+        if pygame.display.get_surface():
+            # Copies into display format, releasing the mapped buffer
+            surface = surface.convert_alpha() if entry["format"] == "RGBA" else surface.convert()
+        else:
+            surface = surface.copy()
+        if entry["colorkey"]:
+            surface.set_colorkey(entry["colorkey"])
+        return surface
+
+    def close(self):
+        self.view.release()
+        self.map.close()
+        self.file.close()
+
+def open_bundle(specs, assets_path, bundle_path):
+    # Opens the bundle, rebuilding stale entries first. Returns None if the
+    # bundle cannot be built (callers then load the source images).
+    try:
+        if is_stale(specs, assets_path, bundle_path):
+            build(specs, assets_path, bundle_path)
+        return Bundle(bundle_path)
+    except (OSError, ValueError, pygame.error) as e:
+        print(f"Asset bundle unavailable ({e}), loading source images")
+        return None
+
+def main(argv=None):
+    # python -m core.bundle [--force] : build the bundle ahead of time
+    from .assets import ASSET_SPECS
+    from .settings import ASSETS_PATH, ASSET_BUNDLE_PATH
+    argv = sys.argv[1:] if argv is None else argv
+    if not ASSET_BUNDLE_PATH:
+        print("asset_bundle is not set in config.json")
+        return 1
+    rebuilt = build(ASSET_SPECS, ASSETS_PATH, ASSET_BUNDLE_PATH, force="--force" in argv)
+    print(f"{ASSET_BUNDLE_PATH}: {len(ASSET_SPECS)} assets, rebuilt {len(rebuilt)}: {', '.join(rebuilt) or '-'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,28 @@
-def check_collision(player, obstacles):
-    if not player.rect:
+import numpy as np
+from .assets import game_assets
+from .obstacles import obstacle_masks
+
+def check_collision(player, obstacles, precise=False):
+    if not player.rect or not obstacles.count:
         return False
-    for obstacle in obstacles:
-        if player.rect.colliderect(obstacle["rect"]):
+    # One array test over every live obstacle
+    slots = np.flatnonzero(obstacles.overlaps(player.rect))
+    if not precise or not len(slots):
+        return len(slots) > 0
+    return _masks_overlap(player, obstacles, slots)
+
+def _masks_overlap(player, obstacles, slots):
+    # Narrow phase, only reached after a rect hit
+    player_mask = game_assets.get_mask(player.current_img)
+    if player_mask is None:
+        return True
+    masks = obstacle_masks()
+    px, py = player.rect.topleft
+    for slot in slots.tolist():
+        mask = masks[obstacles.type_id[slot]]
+        if mask is None:
+            return True
+        offset = (int(obstacles.x[slot]) - px, int(obstacles.y[slot]) - py)
+        if player_mask.overlap(mask, offset):
             return True
-    return False
     return False
@@ -0,0 +1,238 @@
+import json
+import logging
+import os
+import threading
+from .settings import CONFIG, CONFIG_PATH, SPAWN_SCHEDULE
+
+log = logging.getLogger(__name__)
+
+# Live tuning: config.json validated and compiled into a frozen Tuning,
+# re-read when the file changes. A watcher thread polls the file's mtime
+# and does the reading, parsing and compiling; the game loop calls
+# apply() between frames, which only swaps in the finished object and
+# notifies listeners, so a reload never stalls a frame.
+#
+# Code that reads tuning looks up config_service.tuning when it runs
+# (once per update), so a swap takes effect from the next tick. Values
+# baked into assets, the window or compiled tables need a restart; changes
+# to them are reported and otherwise ignored.
+
+# Sections and keys that can change while the game runs
+LIVE_PHYSICS = ("gravity", "jump_velocity", "jump_horizontal_speed", "extra_force_holding",
+                "max_hold_time", "max_jump_height", "max_forward_displacement", "scroll_speed")
+LIVE_KEYS = ("difficulty", "difficulty_settings", "spawn_schedule", "physics")
+# Physics keys used when building animations; the rest of "physics" is live
+RESTART_PHYSICS = ("animation_speed", "jump_frame_duration", "rise_speed", "fall_speed")
+
+PHYSICS_DEFAULTS = {
+    "scroll_speed": 2, "gravity": 1.2, "jump_velocity": -20, "jump_horizontal_speed": 3,
+    "extra_force_holding": -1.0, "max_hold_time": 1000, "max_jump_height": 720,
+    "max_forward_displacement": 500,
+}
+
+class ConfigError(ValueError):
+    pass
+
+def _number(value, path, minimum=None, maximum=None, integer=False):
+    kinds = int if integer else (int, float)
+    if isinstance(value, bool) or not isinstance(value, kinds):
+        raise ConfigError(f"{path}: expected {'an integer' if integer else 'a number'}, got {value!r}")
+    if minimum is not None and value < minimum:
+        raise ConfigError(f"{path}: must be >= {minimum}, got {value!r}")
+    if maximum is not None and value > maximum:
+        raise ConfigError(f"{path}: must be <= {maximum}, got {value!r}")
+    return value
+
+def _section(config, key):
+    value = config.get(key)
+    if not isinstance(value, dict):
+        raise ConfigError(f"{key}: expected an object, got {value!r}")
+    return value
+
+def validate(config):
+    # Raises ConfigError naming the first bad value
+    if not isinstance(config, dict):
+        raise ConfigError("config: expected an object")
+    for key in ("screen_width", "screen_height"):
+        _number(config.get(key), key, 1, integer=True)
+    for key in ("x_position", "ground_y"):
+        _number(config.get(key), key, 0, integer=True)
+
+    levels = _section(config, "difficulty_settings")
+    if not levels:
+        raise ConfigError("difficulty_settings: no difficulty levels")
+    for name, level in levels.items():
+        path = f"difficulty_settings.{name}"
+        if not isinstance(level, dict):
+            raise ConfigError(f"{path}: expected an object")
+        # Packed as u32 in replays and race announcements
+        _number(level.get("spawn_rate"), f"{path}.spawn_rate", 1, 0xFFFFFFFF, integer=True)
+        speed = level.get("speed_range")
+        if not isinstance(speed, list) or len(speed) != 2:
+            raise ConfigError(f"{path}.speed_range: expected [min, max], got {speed!r}")
+        low = _number(speed[0], f"{path}.speed_range[0]", 0, 0xFFFF, integer=True)
+        high = _number(speed[1], f"{path}.speed_range[1]", 0, 0xFFFF, integer=True)
+        if low > high:
+            raise ConfigError(f"{path}.speed_range: min {low} is above max {high}")
+    if config.get("difficulty") not in levels:
+        raise ConfigError(f"difficulty: {config.get('difficulty')!r} is not one of {sorted(levels)}")
+
+    physics = _section(config, "physics")
+    for key in LIVE_PHYSICS + RESTART_PHYSICS:
+        if key in physics:
+            _number(physics[key], f"physics.{key}")
+    for key in ("max_hold_time", "max_jump_height", "max_forward_displacement", "animation_speed"):
+        if key in physics:
+            _number(physics[key], f"physics.{key}", 0)
+
+    schedule = config.get("spawn_schedule", {})
+    if not isinstance(schedule, dict):
+        raise ConfigError("spawn_schedule: expected an object")
+    limits = {
+        "ramp_every": (0, 0xFFFFFFFF, True), "interval_factor": (0.01, 1.0, False),
+        "min_interval_ms": (0, 0xFFFFFFFF, True), "speed_step": (0, None, False),
+        "max_speed": (0, 0xFFFF, True), "frame_budget_ms": (0.1, None, False),
+        "backoff_factor": (1.0, None, False), "max_backoff": (0, None, True),
+        "over_budget_frames": (1, None, True), "recover_frames": (1, None, True),
+    }
+    for key, value in schedule.items():
+        if key not in limits:
+            raise ConfigError(f"spawn_schedule.{key}: unknown key")
+        low, high, integer = limits[key]
+        _number(value, f"spawn_schedule.{key}", low, high, integer)
+
+    if not isinstance(config.get("obstacles"), dict) or not config["obstacles"]:
+        raise ConfigError("obstacles: expected at least one archetype")
+    return config
+
+class Tuning:
+    # Compiled, immutable view of the live-tunable values. Attribute reads
+    # are plain slot lookups; settings and schedule are the dicts GameSim
+    # and the spawn scheduler take (treat them as read-only).
+    __slots__ = ("difficulty", "settings", "schedule", "levels") + LIVE_PHYSICS
+
+    def __init__(self, config):
+        physics = dict(PHYSICS_DEFAULTS, **config["physics"])
+        for key in LIVE_PHYSICS:
+            object.__setattr__(self, key, physics[key])
+        levels = {name: {"spawn_rate": level["spawn_rate"], "speed_range": list(level["speed_range"])}
+                  for name, level in config["difficulty_settings"].items()}
+        object.__setattr__(self, "levels", levels)
+        object.__setattr__(self, "difficulty", config["difficulty"])
+        object.__setattr__(self, "settings", levels[config["difficulty"]])
+        object.__setattr__(self, "schedule", dict(SPAWN_SCHEDULE, **config.get("spawn_schedule", {})))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __eq__(self, other):
+        return isinstance(other, Tuning) and all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    __hash__ = None
+
+def compile_config(config):
+    return Tuning(validate(config))
+
+class ConfigService:
+    def __init__(self, path=CONFIG_PATH, config=None, poll_interval=0.5):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.config = config if config is not None else self._read()
+        self.tuning = compile_config(self.config)
+        self.listeners = [] # Called with the new Tuning after each swap
+        self.pending = None # Compiled by the watcher, swapped in by apply()
+        self.pending_config = None
+        self._lock = threading.Lock()
+        self._stamp = self._file_stamp()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _read(self):
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def watch(self):
+        # Starts the mtime-polling thread (once)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="config-watch", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.poll()
+
+    def poll(self):
+        # One mtime check, reloading on change; returns True when a new
+        # Tuning was queued. Safe to call from any thread.
+        stamp = self._file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            config = self._read()
+            tuning = compile_config(config)
+        except (OSError, ValueError) as e:
+            # A half-written file fails to parse; the finished write changes the stamp again
+            log.error("config reload failed, keeping the current values: %s", e)
+            return False
+        return self._queue(config, tuning)
+
+    def set_difficulty(self, name):
+        # Switches the live difficulty (e.g. on request from a server); takes
+        # effect at the next apply(). Safe to call from any thread.
+        with self._lock:
+            config = dict(self.pending_config if self.pending is not None else self.config, difficulty=name)
+        return self._queue(config, compile_config(config))
+
+    def _queue(self, config, tuning):
+        with self._lock:
+            base = self.pending_config if self.pending is not None else self.config
+            restart = sorted(key for key in set(config) | set(base)
+                             if key not in LIVE_KEYS and config.get(key) != base.get(key))
+            restart += [f"physics.{key}" for key in RESTART_PHYSICS
+                        if config["physics"].get(key) != base["physics"].get(key)]
+            if restart:
+                log.warning("config: %s changed; restart to apply", ", ".join(restart))
+                # Keep running with the old values for everything restart-only
+                config = dict(base, **{key: config[key] for key in LIVE_KEYS if key in config})
+                config["physics"] = dict(config["physics"],
+                                         **{key: base["physics"][key] for key in RESTART_PHYSICS
+                                            if key in base["physics"]})
+            current = self.pending if self.pending is not None else self.tuning
+            if tuning == current:
+                return False
+            self.pending = tuning
+            self.pending_config = config
+            return True
+
+    def apply(self):
+        # Called between frames: swaps in a queued Tuning and notifies the
+        # listeners. Returns the new Tuning, or None when nothing changed.
+        if self.pending is None:
+            return None
+        with self._lock:
+            tuning, self.pending = self.pending, None
+            self.config = self.pending_config
+        self.tuning = tuning
+        log.info("config: applied (difficulty %s, spawn every %s ms, speed %s-%s, gravity %s)",
+                 tuning.difficulty, tuning.settings["spawn_rate"], *tuning.settings["speed_range"], tuning.gravity)
+        for listener in self.listeners:
+            listener(tuning)
+        return tuning
+
+# Shared instance over config.json, compiled from the values settings.py loaded
+config_service = ConfigService(CONFIG_PATH, CONFIG)
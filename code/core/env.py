@@ -0,0 +1,310 @@
+import random
+import numpy as np
+from .settings import CURRENT_SETTINGS, SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_Y, X_POSITION
+from .config import config_service
+from .simulation import GameSim, SIM_STEP_MS, ROLL_SCROLL_BOOST, INPUT_UP, INPUT_RIGHT, INPUT_LEFT
+from .obstacles import OBSTACLE_TYPES, create_obstacle
+from .scheduler import SpawnScheduler
+from .player import player_clips
+
+# Gym-style training environments: reset() -> obs, step(actions) ->
+# (obs, reward, done, info). An action is the tick's input bitmask
+# (INPUT_UP | INPUT_RIGHT | INPUT_LEFT, 0-7); the reward is the points
+# scored that step. Nothing is rendered.
+#
+# RunnerEnv drives one GameSim. VecRunnerEnv steps N independent games as
+# whole-array operations: the same rules as GameSim.tick (player states
+# and physics, create_obstacle spawns on per-env SpawnSchedulers, obstacle
+# movement and rect collision) over [N] player arrays and [N, slots]
+# obstacle arrays. Seeded the same, an env plays the exact game GameSim
+# plays with the same inputs.
+
+ACTION_COUNT = 8
+
+# Player states in observations / VecRunnerEnv
+READY, ROLL, JUMP, STOP = range(4)
+STATE_IDS = {"idle": READY, "ready": READY, "run": READY, "roll": ROLL, "jump": JUMP, "stop": STOP}
+
+NEAREST = 3 # Obstacles described per observation
+PLAYER_FEATURES = 6 # height, vertical velocity, state one-hot (4)
+OBSTACLE_FEATURES = 7 # dx, dy, leftward speed, downward speed, width, height, present
+
+def observation_size(nearest=NEAREST):
+    return PLAYER_FEATURES + nearest * OBSTACLE_FEATURES
+
+def observe(out, y, vel_y, state, center_y, ox, oy, ow, oh, ovx, ovy, live):
+    # Fills out[N, observation_size] from player arrays [N] and obstacle
+    # arrays [N, slots]. Obstacles are ordered nearest first by the
+    # distance between centers; missing ones are all zeros.
+    n = len(out)
+    nearest = (out.shape[1] - PLAYER_FEATURES) // OBSTACLE_FEATURES
+    out[:, 0] = (GROUND_Y - y) / SCREEN_HEIGHT
+    out[:, 1] = vel_y / 20.0
+    out[:, 2:PLAYER_FEATURES] = 0
+    out[np.arange(n), 2 + state] = 1
+
+    dx = ox + ow / 2 - X_POSITION
+    dy = oy + oh / 2 - center_y[:, None]
+    dist = np.where(live, dx * dx + dy * dy, np.inf)
+    k = min(nearest, dist.shape[1])
+    if k < dist.shape[1]:
+        idx = np.argpartition(dist, k - 1, axis=1)[:, :k]
+    else:
+        idx = np.broadcast_to(np.arange(k), (n, k))
+    idx = np.take_along_axis(idx, np.argsort(np.take_along_axis(dist, idx, axis=1), axis=1), axis=1)
+
+    present = np.take_along_axis(live, idx, axis=1)
+    features = out[:, PLAYER_FEATURES:].reshape(n, nearest, OBSTACLE_FEATURES)
+    features[:] = 0
+    take = np.take_along_axis
+    columns = (take(dx, idx, axis=1) / SCREEN_WIDTH, take(dy, idx, axis=1) / SCREEN_HEIGHT,
+               take(ovx, idx, axis=1) / 10.0, take(ovy, idx, axis=1) / 10.0,
+               take(ow, idx, axis=1) / SCREEN_WIDTH, take(oh, idx, axis=1) / SCREEN_HEIGHT, present)
+    for i, column in enumerate(columns):
+        features[:, :k, i] = np.where(present, column, 0)
+    return out
+
+class RunnerEnv:
+    # Single environment on top of GameSim (reference implementation)
+    def __init__(self, settings=None, seed=0, nearest=NEAREST, schedule=None):
+        self.sim = GameSim(settings, precise=False, seed=seed, schedule=schedule)
+        self.next_seed = seed
+        self.obs = np.zeros((1, observation_size(nearest)), dtype=np.float32)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.next_seed = seed
+        self.sim.reset(self.next_seed)
+        self.next_seed += 1
+        return self._observe()
+
+    def step(self, action):
+        sim = self.sim
+        score = sim.score
+        sim.tick(int(action) & (INPUT_UP | INPUT_RIGHT | INPUT_LEFT))
+        reward = sim.score - score
+        info = {"score": sim.score, "ticks": sim.tick_count}
+        return self._observe(), reward, sim.game_over, info
+
+    def _observe(self):
+        sim = self.sim
+        player = sim.player
+        store = sim.obstacles
+        n = store.count
+        center_y = player.rect.centery if player.rect else player.y_position
+        arrays = [a[:n][None, :] for a in (store.x, store.y, store.w, store.h, store.vx, store.vy)]
+        observe(self.obs, np.array([player.y_position], dtype=np.float64), np.array([player.vel_y], dtype=np.float64),
+                np.array([STATE_IDS[player.state]]), np.array([center_y], dtype=np.float64),
+                *arrays, np.ones((1, n), dtype=bool))
+        return self.obs[0]
+
+class _EnvSlots:
+    # create_obstacle() target writing into one env's row of VecRunnerEnv
+    def __init__(self, env):
+        self.env = env
+        self.types = OBSTACLE_TYPES
+        self.row = 0
+
+    def add(self, type_id, x, y, w, h, vx, vy):
+        env = self.env
+        free = np.flatnonzero(~env.live[self.row])
+        if not len(free):
+            env._grow()
+            free = np.flatnonzero(~env.live[self.row])
+        slot = free[0]
+        row = self.row
+        env.otype[row, slot] = type_id
+        env.ox[row, slot] = x
+        env.oy[row, slot] = y
+        env.ow[row, slot] = w
+        env.oh[row, slot] = h
+        env.ovx[row, slot] = vx
+        env.ovy[row, slot] = vy
+        env.ofloor[row, slot] = self.types.floor_y[type_id]
+        env.live[row, slot] = True
+        return slot
+
+class VecRunnerEnv:
+    # N independent games stepped together. Finished games reset on their
+    # own (with the next seed) inside step(); the returned observation is
+    # then the new game's first one, and info carries the finished scores.
+    def __init__(self, num_envs, settings=None, seed=0, slots=16, nearest=NEAREST, schedule=None):
+        self.num_envs = n = num_envs
+        self.settings = settings if settings is not None else CURRENT_SETTINGS
+        # Physics as configured when the env was built (GameSim reads the live values per tick)
+        self.tuning = config_service.tuning
+        self.schedule = schedule # Spawn schedule parameters (None: config.json)
+        self.next_seed = seed
+        self.seeds = np.zeros(n, dtype=np.int64)
+        self.rngs = [None] * n
+        self.schedulers = [SpawnScheduler(self.settings, schedule) for _ in range(n)]
+        self._slots = _EnvSlots(self)
+
+        # Player geometry per state from the animation clips: (w, h) and
+        # the anchor's vertical offset (every frame of a clip shares them)
+        clips = player_clips()
+        geometry = [clips[name] for name in ("run", "roll", "jump", "stand")]
+        for clip in geometry:
+            if len(set(clip.sizes)) > 1 or len(set(clip.anchors)) > 1:
+                raise ValueError("VecRunnerEnv needs player clips whose frames share one size and anchor")
+        self.player_w = np.array([clip.sizes[0][0] for clip in geometry], dtype=np.int64)
+        self.player_h = np.array([clip.sizes[0][1] for clip in geometry], dtype=np.int64)
+        self.anchor_y = np.array([clip.anchors[0][1] for clip in geometry], dtype=np.float64)
+
+        self.y = np.full(n, float(GROUND_Y))
+        self.vel_y = np.zeros(n)
+        self.state = np.zeros(n, dtype=np.int64)
+        self.jump_start = np.zeros(n)
+        self.jump_from_y = np.zeros(n)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.tuned_score = np.zeros(n, dtype=np.int64)
+        self.timer = np.zeros(n)
+        self.interval = np.zeros(n)
+        self.center_y = np.zeros(n)
+
+        self.capacity = 0
+        self._allocate(slots)
+        self.obs = np.zeros((n, observation_size(nearest)), dtype=np.float32)
+
+    def _allocate(self, slots):
+        n = self.num_envs
+        old = self.capacity
+        for name, dtype in (("ox", np.float64), ("oy", np.float64), ("ow", np.float64), ("oh", np.float64),
+                            ("ovx", np.float64), ("ovy", np.float64), ("ofloor", np.float64),
+                            ("otype", np.int8), ("live", bool)):
+            arr = np.zeros((n, slots), dtype=dtype)
+            if old:
+                arr[:, :old] = getattr(self, name)
+            setattr(self, name, arr)
+        self.capacity = slots
+
+    def _grow(self):
+        self._allocate(self.capacity * 2)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.next_seed = seed
+        for i in range(self.num_envs):
+            self._reset_env(i)
+        return observe(self.obs, self.y, self.vel_y, self.state, self.center_y,
+                       self.ox, self.oy, self.ow, self.oh, self.ovx, self.ovy, self.live)
+
+    def _reset_env(self, i):
+        # Same starting state as GameSim.reset(seed)
+        seed = self.seeds[i] = self.next_seed
+        self.next_seed += 1
+        if self.rngs[i] is None:
+            self.rngs[i] = random.Random()
+        self.rngs[i].seed(int(seed))
+        scheduler = self.schedulers[i]
+        scheduler.reset(self.settings, self.schedule)
+        self.timer[i] = 0.0
+        self.interval[i] = scheduler.interval
+        self.tuned_score[i] = 0
+        self.score[i] = 0
+        self.ticks[i] = 0
+        self.y[i] = GROUND_Y
+        self.vel_y[i] = 0.0
+        self.state[i] = READY
+        self.jump_from_y[i] = GROUND_Y
+        self.center_y[i] = GROUND_Y + self.anchor_y[READY]
+        self.live[i] = False
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.int64)
+        up = (actions & INPUT_UP) != 0
+        right = (actions & INPUT_RIGHT) != 0
+        left = (actions & INPUT_LEFT) != 0
+        self.ticks += 1
+        time_ms = self.ticks * SIM_STEP_MS
+
+        # 1. Spawning: per-env timers; the few envs due this tick spawn
+        # through create_obstacle with their own rng and schedule
+        changed = np.flatnonzero(self.score != self.tuned_score)
+        for i in changed.tolist():
+            scheduler = self.schedulers[i]
+            scheduler.retune(int(self.score[i]))
+            self.interval[i] = scheduler.interval
+            self.tuned_score[i] = self.score[i]
+        self.timer += SIM_STEP_MS
+        due = np.flatnonzero(self.timer >= self.interval)
+        if len(due):
+            self.timer[due] -= self.interval[due]
+            slots = self._slots
+            for i in due.tolist():
+                slots.row = i
+                # Bombs target the player's rect center, fixed at X_POSITION
+                create_obstacle(slots, X_POSITION, self.rngs[i], self.schedulers[i].settings)
+
+        # 2. Player (mirrors Player.update for the states' rect geometry)
+        state = self.state
+        ready = state == READY
+        to_roll = ready & right
+        to_jump = ready & ~right & up
+        to_stop = ready & ~right & ~up & left
+        state[to_roll] = ROLL
+        state[to_jump] = JUMP
+        state[to_stop] = STOP
+        tuning = self.tuning
+        self.vel_y[to_jump] = tuning.jump_velocity
+        self.jump_start[to_jump] = time_ms[to_jump]
+        self.jump_from_y[to_jump] = self.y[to_jump]
+
+        state[(state == STOP) & ~left] = READY
+        state[(state == ROLL) & ~right] = READY
+        self.y[state == ROLL] = GROUND_Y
+
+        jumping = np.flatnonzero(state == JUMP)
+        if len(jumping):
+            y = self.y[jumping]
+            vel = self.vel_y[jumping]
+            hold = (up[jumping] & (time_ms[jumping] - self.jump_start[jumping] < tuning.max_hold_time)
+                    & (self.jump_from_y[jumping] - y < tuning.max_jump_height))
+            vel = np.where(hold, vel + tuning.extra_force_holding, vel)
+            vel = vel + tuning.gravity
+            y = y + vel
+            landed = y >= GROUND_Y
+            y[landed] = GROUND_Y
+            vel[landed] = 0
+            state[jumping[landed]] = READY
+            self.y[jumping] = y
+            self.vel_y[jumping] = vel
+        self.y[state == READY] = GROUND_Y
+
+        # Rect, as Player places it: center = (int(x), int(y + anchor))
+        cy = (self.y + self.anchor_y[state]).astype(np.int64)
+        w = self.player_w[state]
+        h = self.player_h[state]
+        left_x = X_POSITION - w // 2
+        top = cy - h // 2
+        self.center_y = top + h // 2
+
+        # 3./5. Obstacles: scroll boost from the player's state, move, cull, score
+        boost = np.where(state == ROLL, ROLL_SCROLL_BOOST, np.where(state == JUMP, tuning.jump_horizontal_speed, 0))
+        live = self.live
+        self.ox -= self.ovx + boost[:, None]
+        self.oy += self.ovy
+        dead = live & ((self.ox + self.ow < 0) | (self.oy > self.ofloor))
+        reward = np.zeros(self.num_envs, dtype=np.int64)
+        if dead.any():
+            points = np.where(dead, OBSTACLE_TYPES.score[self.otype], 0).sum(axis=1)
+            reward += points
+            self.score += points
+            live &= ~dead
+
+        # 6. Collision (rect overlap, as check_collision with precise off)
+        hit = live & (self.ox < (left_x + w)[:, None]) & (self.ox + self.ow > left_x[:, None]) \
+                   & (self.oy < (top + h)[:, None]) & (self.oy + self.oh > top[:, None])
+        done = hit.any(axis=1)
+
+        info = {}
+        if done.any():
+            finished = np.flatnonzero(done)
+            info = {"final_score": self.score[finished].copy(), "final_ticks": self.ticks[finished].copy(),
+                    "seeds": self.seeds[finished].copy(), "envs": finished}
+            for i in finished.tolist():
+                self._reset_env(i)
+        obs = observe(self.obs, self.y, self.vel_y, self.state, self.center_y,
+                      self.ox, self.oy, self.ow, self.oh, self.ovx, self.ovy, self.live)
+        return obs, reward, done, info
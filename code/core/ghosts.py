@@ -0,0 +1,42 @@
+import time
+from .settings import MULTIPLAYER
+from .player import player_clips
+
+# Remote players drawn as translucent copies of the player's own frames.
+# Which clip a ghost shows follows from its state, exactly as in
+# Player.update; the frame index comes over the wire.
+STATE_CLIPS = {"ready": "run", "run": "run", "roll": "roll", "jump": "jump", "stop": "stand"}
+
+_clips = None
+
+def ghost_clips():
+    # Translucent copies of the player clips' frames, built once (the
+    # originals are shared atlas subsurfaces, so they can't carry an alpha)
+    global _clips
+    if _clips is None:
+        _clips = {}
+        for name, clip in player_clips().items():
+            frames = []
+            for frame in clip.frames:
+                frame = frame.copy()
+                frame.set_alpha(MULTIPLAYER["ghost_alpha"])
+                frames.append(frame)
+            _clips[name] = (tuple(frames), clip.anchors)
+    return _clips
+
+def draw_ghosts(screen, ghosts, interval, now=None):
+    # ghosts: core.net.Ghost objects. Returns the screen areas drawn.
+    now = time.perf_counter() if now is None else now
+    clips = ghost_clips()
+    areas = []
+    for ghost in ghosts:
+        x, y, state, frame = ghost.pose(now, interval)
+        clip = STATE_CLIPS.get(state)
+        if clip is None:
+            continue
+        frames, anchors = clips[clip]
+        frame = min(frame, len(frames) - 1)
+        surface = frames[frame]
+        anchor_x, anchor_y = anchors[frame]
+        areas.append(screen.blit(surface, surface.get_rect(center=(int(x + anchor_x), int(y + anchor_y)))))
+    return areas
@@ -2,37 +2,42 @@ import pygame
 import os
 import math
 from .settings import SCREEN_WIDTH, SCREEN_HEIGHT, ASSETS_PATH
+from .assets import game_assets
 
 class IntroUI:
+    # Slides are composed from layers built once in __init__; per frame only
+    # the animated parts (title slide-in, loading bar, typewriter, cursor,
+    # pulsing button) are drawn on top of a pre-composited background.
     def __init__(self):
         self.state = "title_loading" # title_loading, controls_instruction
         self.start_time = pygame.time.get_ticks()
-        
+
         # --- Load Assets ---
-        self.bg1 = self._load_image("intro_bg.jpg")
-        self.bg2 = self._load_image("intro_bg2.jpg")
-        
+        # Loaded with the other assets (bundle-backed); direct load as fallback
+        self.bg1 = game_assets.intro_bg or self._load_image("intro_bg.jpg")
+        self.bg2 = game_assets.intro_bg2 or self._load_image("intro_bg2.jpg")
+
         # Fonts
         self.title_font_size = 150
         self.title_font = pygame.font.Font(None, self.title_font_size)
-        
+
         self.slide2_font_size = 60 # Slightly smaller to accommodate content
         self.slide2_font = pygame.font.Font(None, self.slide2_font_size)
-        
+
         # Huge Tagline Font
-        self.tagline_font_size = 90 
+        self.tagline_font_size = 90
         self.tagline_font = pygame.font.Font(None, self.tagline_font_size)
-        
+
         self.button_font = pygame.font.Font(None, 50)
-        
+
         # Slide 1 Config
         self.s1_duration = 5000
-        
+
         # Slide 2 Config
         self.play_button_rect = pygame.Rect(0, 0, 240, 65)
         # Position Bottom Left: Margin 150, Bottom 80
         self.play_button_rect.bottomleft = (150, SCREEN_HEIGHT - 80)
-        
+
         self.tagline_colors = [
             (0, 255, 209), # #00FFD1
             (255, 215, 0), # #FFD700
@@ -41,6 +46,10 @@ class IntroUI:
             (77, 150, 255)  # #4D96FF
         ]
 
+        # --- Pre-composed layers ---
+        self._build_slide1()
+        self._build_slide2()
+
     def _load_image(self, filename):
         try:
             path = os.path.join(ASSETS_PATH, filename)
@@ -49,7 +58,7 @@ class IntroUI:
                 return pygame.transform.scale(img, (SCREEN_WIDTH, SCREEN_HEIGHT))
         except Exception as e:
             print(f"Error loading {filename}: {e}")
-        
+
         s = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         s.fill((20, 20, 40))
         return s
@@ -66,209 +75,217 @@ class IntroUI:
     def draw(self, screen):
         current_time = pygame.time.get_ticks()
         elapsed = current_time - self.start_time
-        
+
         if self.state == "title_loading":
             if elapsed >= self.s1_duration:
                 self.state = "controls_instruction"
                 self.start_time = current_time
                 elapsed = 0
-            
+
             self._draw_slide1(screen, elapsed)
-            
+
         elif self.state == "controls_instruction":
-            self.play_button_rect.bottomleft = (150, SCREEN_HEIGHT - 80)
             self._draw_slide2(screen, elapsed)
 
-    def _draw_slide1(self, screen, elapsed):
-        screen.blit(self.bg1, (0, 0))
-        
+    # --- Slide 1: title + loading bar ---
+
+    def _build_slide1(self):
         margin_right = 150
-        target_right_x = SCREEN_WIDTH - margin_right
-        
-        anim_duration = 1200
-        t = min(elapsed / anim_duration, 1.0)
-        eased_t = 1 - (1 - t)**3 
-        
-        start_offset = 600
-        current_offset = start_offset * (1 - eased_t)
-        
+        self.s1_target_right_x = SCREEN_WIDTH - margin_right
+        self.s1_anim_duration = 1200
+        self.s1_start_offset = 600
+
         lines = ["Arcade", "Runner"]
         line_spacing = 20
-        
+
         line_heights = [self.title_font.size(line)[1] for line in lines]
         total_text_height = sum(line_heights) + line_spacing * (len(lines) - 1)
-        start_y = (SCREEN_HEIGHT - total_text_height) // 2 - 50 
-        
+        start_y = (SCREEN_HEIGHT - total_text_height) // 2 - 50
+
+        # (surface, width of the text without shadow, y)
+        self.s1_lines = []
         current_y = start_y
         for line in lines:
-            self._draw_text_with_effects(screen, line, self.title_font, (255, 255, 255), 
-                                       target_right_x + current_offset, current_y, "right")
+            surf, width = self._render_text_with_effects(line, self.title_font, (255, 255, 255))
+            self.s1_lines.append((surf, width, current_y))
             current_y += self.title_font.size(line)[1] + line_spacing
 
-        bar_w = int(SCREEN_WIDTH * 0.25)
-        bar_h = 12
-        bar_y = current_y + 40
-        bar_x = target_right_x + current_offset - bar_w
-        
+        self.s1_bar_w = int(SCREEN_WIDTH * 0.25)
+        self.s1_bar_h = 12
+        self.s1_bar_y = current_y + 40
+
+        # Background + title at rest, used once the slide-in has finished
+        self.s1_settled = self.bg1.copy()
+        self._blit_title(self.s1_settled, 0)
+
+    def _blit_title(self, screen, offset):
+        right_x = self.s1_target_right_x + offset
+        for surf, width, y in self.s1_lines:
+            screen.blit(surf, (right_x - width, y))
+
+    def _draw_slide1(self, screen, elapsed):
+        t = min(elapsed / self.s1_anim_duration, 1.0)
+        eased_t = 1 - (1 - t)**3
+        current_offset = self.s1_start_offset * (1 - eased_t)
+
+        if t < 1.0:
+            screen.blit(self.bg1, (0, 0))
+            self._blit_title(screen, current_offset)
+        else:
+            screen.blit(self.s1_settled, (0, 0))
+
+        bar_w = self.s1_bar_w
+        bar_h = self.s1_bar_h
+        bar_y = self.s1_bar_y
+        bar_x = self.s1_target_right_x + current_offset - bar_w
+
         pygame.draw.rect(screen, (44, 44, 44), (bar_x, bar_y, bar_w, bar_h), border_radius=10)
-        
+
         fill_progress = min(elapsed / 5000.0, 1.0)
         fill_width = int(bar_w * fill_progress)
         if fill_width > 0:
             pygame.draw.rect(screen, (0, 255, 209), (bar_x, bar_y, fill_width, bar_h), border_radius=10)
 
-    def _draw_slide2(self, screen, elapsed):
-        screen.blit(self.bg2, (0, 0))
-        
+    # --- Slide 2: controls, typewriter tagline, play button ---
+
+    def _build_slide2(self):
         margin_left = 150
-        
-        # --- Controls: Top Left Block ---
+
+        # --- Static layer: background + controls block (Top Left) ---
+        self.s2_static = self.bg2.copy()
+
         # "Jump with", "Roll with", "Pause with"
         c_jump = (0, 255, 209)
         c_roll = (255, 215, 0)
         c_pause = (255, 107, 107)
-        c_white = (255, 255, 255)
-        
+
         items = [
             {"text": "Jump with ", "icon": "UP", "color": c_jump},
             {"text": "Roll with ", "icon": "RIGHT", "color": c_roll},
             {"text": "Pause with ", "icon": "SPACE", "color": c_pause},
         ]
-        
+
         start_y = 100
         gap = 70
-        
+
         for i, item in enumerate(items):
             y_pos = start_y + i * gap
             col = item["color"]
-            
+
             # Text
             txt_surf = self.slide2_font.render(item["text"], True, col)
-            screen.blit(txt_surf, (margin_left, y_pos))
-            
+            self.s2_static.blit(txt_surf, (margin_left, y_pos))
+
             # Icon (12px spacing)
             icon_x = margin_left + txt_surf.get_width() + 70
             icon_y = y_pos + txt_surf.get_height() // 2
-            
-            self._draw_key_icon(screen, (icon_x, icon_y), item["icon"], col)
 
-        # --- Tagline: Typewriter, Centered ---
+            self._draw_key_icon(self.s2_static, (icon_x, icon_y), item["icon"], col)
+
+        # --- Tagline: Typewriter, word surfaces laid out once ---
         # Explicit lines as requested
         raw_lines = [
             "\"dodge danger,",
             "move fast, and",
             "survive the run!\""
         ]
-        
-        all_lines = []
-        total_chars = 0
-        
-        for line_text in raw_lines:
-            line_objs = []
-            # Split manually preserving space logic for typewriter
-            # We treat the line as a sequence of words
-            for word in line_text.split(" "):
-                 # White color fixed
-                 surf = self.tagline_font.render(word + " ", True, (255, 255, 255))
-                 w_len = len(word) + 1 # +1 for the space we added in render
-                 line_objs.append({"surf": surf, "text": word, "len": w_len})
-                 total_chars += w_len
-            all_lines.append(line_objs)
-            
-        # Animation: 40ms per char
-        visible_chars_count = min(int(elapsed / 40.0), total_chars)
-        
+
         # Layout Config
         area_x = margin_left
-        area_y_start = 320 
+        area_y_start = 320
         line_spacing = self.tagline_font_size * 0.9
 
-        # Draw Typewriter
-        chars_so_far = 0
-        cursor_pos = None
-        
+        # Words appear whole once their characters are "typed"; this avoids
+        # partial rendering artifacts with variable width fonts.
+        # (surface, position, chars typed when the word is complete)
+        self.s2_words = []
+        total_chars = 0
         current_y = area_y_start
-        for line in all_lines:
+        for line_text in raw_lines:
             current_x = area_x
-            for lw in line:
-                 # Check how many chars of this word are visible
-                 w_len = lw["len"] # inc space
-                 if chars_so_far + w_len <= visible_chars_count:
-                     # Full word visible
-                     screen.blit(lw["surf"], (current_x, current_y))
-                     current_x += lw["surf"].get_width()
-                     chars_so_far += w_len
-                 else:
-                     # Partial word?
-                     remain = visible_chars_count - chars_so_far
-                     if remain > 0:
-                         # Render partial
-                         partial_text = (lw["text"] + " ")[:remain]
-                         # Find color from surf? Need to re-render partial
-                         # Hack: layout_words has surf, we can get color from tagline_colors
-                         # Need index of word in 'words' list... logic above lost index.
-                         # Simplified: Re-find index or store it.
-                         pass 
-                         # For now, just show full word if mostly typed or skip partials for clean look
-                         # Or just render whole words for "Typewriter" usually means chars.
-                         # Let's just assume whole words appear or fix partial render
-                         
-                         # Actually, let's just do Char-by-Char logic purely for "Typewriter"
-                         # But we need Wrapping + Colors per word.
-                         # This is complex. Let's simplify: 
-                         # Just show full words as they become "unlocked" by char count
-                         # This avoids partial rendering artifacts with variable width fonts
-                     
-                     cursor_pos = (current_x, current_y)
-                     chars_so_far += w_len # Count them as processed loop
-                     break # Stop this line
-            
-            if chars_so_far > visible_chars_count:
-                 break # Stop drawing lines
-            
+            for word in line_text.split(" "):
+                 # White color fixed
+                 surf = self.tagline_font.render(word + " ", True, (255, 255, 255))
+                 total_chars += len(word) + 1 # +1 for the space we added in render
+                 self.s2_words.append((surf, (current_x, current_y), total_chars))
+                 current_x += surf.get_width()
             current_y += line_spacing
+        self.s2_total_chars = total_chars
 
-        # Cursor Blink
-        if cursor_pos and (elapsed // 500) % 2 == 0:
-            pygame.draw.rect(screen, (255, 255, 255), (cursor_pos[0], cursor_pos[1], 10, 100))
+        # Static layer with the full tagline, once the typewriter is done
+        self.s2_complete = self.s2_static.copy()
+        for surf, pos, _ in self.s2_words:
+            self.s2_complete.blit(surf, pos)
 
+        # --- Play Button: one sprite per pulse size ---
+        self.s2_button_pad = 8
+        self.s2_button_frames = [self._render_play_button(scale_px) for scale_px in range(5)]
+
+    def _render_play_button(self, scale_px):
+        # Drawn in a sprite whose origin sits `pad` px above/left of the
+        # button rect, leaving room for the pulse, glow and shadow offset
+        pad = self.s2_button_pad
+        base = self.play_button_rect
+        surf = pygame.Surface((base.width + pad * 2, base.height + pad * 2), pygame.SRCALPHA)
+        draw_rect = base.inflate(scale_px, scale_px).move(pad - base.x, pad - base.y)
 
-        # --- Play Button (Bottom Left) ---
-        pulse_val = (math.sin(elapsed * 0.005) + 1) / 2
-        scale_px = int(4 * pulse_val)
-        draw_rect = self.play_button_rect.inflate(scale_px, scale_px)
-        
         # Shadow
         shadow_rect = draw_rect.copy()
         shadow_rect.move_ip(4, 4)
-        pygame.draw.rect(screen, (0,0,0), shadow_rect, border_radius=35)
-        
+        pygame.draw.rect(surf, (0,0,0), shadow_rect, border_radius=35)
+
         # Glow
         for i in range(3):
-            pygame.draw.rect(screen, (0, 255, 209), draw_rect.inflate(i*2, i*2), width=1, border_radius=35)
-            
+            pygame.draw.rect(surf, (0, 255, 209), draw_rect.inflate(i*2, i*2), width=1, border_radius=35)
+
         # Body
-        pygame.draw.rect(screen, (0, 255, 209), draw_rect, border_radius=35)
-        
+        pygame.draw.rect(surf, (0, 255, 209), draw_rect, border_radius=35)
+
         # Text
         btn_txt = self.button_font.render("PLAY", True, (10, 10, 10))
         btn_rect = btn_txt.get_rect(center=draw_rect.center)
-        screen.blit(btn_txt, btn_rect)
+        surf.blit(btn_txt, btn_rect)
+        return surf
+
+    def _draw_slide2(self, screen, elapsed):
+        # Animation: 40ms per char
+        visible_chars_count = min(int(elapsed / 40.0), self.s2_total_chars)
+
+        if visible_chars_count >= self.s2_total_chars:
+            screen.blit(self.s2_complete, (0, 0))
+        else:
+            screen.blit(self.s2_static, (0, 0))
+
+            # Draw Typewriter
+            cursor_pos = None
+            for surf, pos, chars_done in self.s2_words:
+                if chars_done > visible_chars_count:
+                    cursor_pos = pos
+                    break
+                screen.blit(surf, pos)
+
+            # Cursor Blink
+            if cursor_pos and (elapsed // 500) % 2 == 0:
+                pygame.draw.rect(screen, (255, 255, 255), (cursor_pos[0], cursor_pos[1], 10, 100))
+
+        # --- Play Button (Bottom Left) ---
+        pulse_val = (math.sin(elapsed * 0.005) + 1) / 2
+        scale_px = int(4 * pulse_val)
+        pad = self.s2_button_pad
+        screen.blit(self.s2_button_frames[scale_px], (self.play_button_rect.x - pad, self.play_button_rect.y - pad))
 
-    def _draw_text_with_effects(self, screen, text, font, color, x, y, align="center"):
+    def _render_text_with_effects(self, text, font, color):
+        # Drop-shadowed text composed into one surface; returns it with the
+        # width of the text itself (the shadow hangs off the right/bottom)
         shadow_dist = 4
-        shadow_surf = font.render(text, True, (0, 0, 0))
-        glow_surf = font.render(text, True, (255, 255, 255))
         main_surf = font.render(text, True, color)
-        if align == "right":
-            rect = main_surf.get_rect(topright=(x, y))
-        elif align == "left":
-            rect = main_surf.get_rect(topleft=(x, y))
-        else:
-            rect = main_surf.get_rect(center=(x, y))
-        screen.blit(shadow_surf, (rect.x + shadow_dist, rect.y + shadow_dist))
-        screen.blit(main_surf, rect)
-        
+        shadow_surf = font.render(text, True, (0, 0, 0))
+        width, height = main_surf.get_size()
+        surf = pygame.Surface((width + shadow_dist, height + shadow_dist), pygame.SRCALPHA)
+        surf.blit(shadow_surf, (shadow_dist, shadow_dist))
+        surf.blit(main_surf, (0, 0))
+        return surf, width
+
     def _draw_key_icon(self, screen, center_pos, icon_type, color):
         cx, cy = center_pos
         w, h = 50, 50
@@ -276,9 +293,9 @@ class IntroUI:
             w = 140
         rect = pygame.Rect(0, 0, w, h)
         rect.center = center_pos
-        
+
         pygame.draw.rect(screen, color, rect, width=3, border_radius=8)
-        
+
         if icon_type == "UP":
             pygame.draw.polygon(screen, color, [(cx, cy - 12), (cx - 8, cy + 4), (cx + 8, cy + 4)])
             pygame.draw.rect(screen, color, (cx - 3, cy + 4, 6, 8))
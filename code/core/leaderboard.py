@@ -0,0 +1,179 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+# Local leaderboard in SQLite (WAL mode). One worker thread owns the
+# connection and does every insert and query; the game loop only reads
+# an in-memory cache and queues work, so finishing a run never waits on
+# the disk.
+#
+# Reads return the cached answer, or None while it's being fetched (the
+# worker fills it in the background; ask again next frame). An insert
+# invalidates the cache: the worker re-runs the queries that were cached
+# and swaps in the fresh results in one step.
+#
+# Scale: top-N reads walk the (difficulty, score) / (score) indexes, and
+# per-day bests come from a small summary table kept up to date on insert,
+# so no query touches more than N rows or one row per day however many
+# runs are stored.
+
+Entry = namedtuple("Entry", "score difficulty played_at ticks seed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    difficulty TEXT NOT NULL,
+    day TEXT NOT NULL,
+    played_at REAL NOT NULL,
+    ticks INTEGER NOT NULL,
+    seed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_difficulty ON runs (difficulty, score DESC);
+CREATE TABLE IF NOT EXISTS daily_best (
+    day TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (day, difficulty)
+) WITHOUT ROWID;
+"""
+
+TOP_SQL = "SELECT score, difficulty, played_at, ticks, seed FROM runs ORDER BY score DESC, id LIMIT ?"
+TOP_BY_DIFFICULTY_SQL = ("SELECT score, difficulty, played_at, ticks, seed FROM runs WHERE difficulty = ? "
+                         "ORDER BY score DESC, id LIMIT ?")
+DAILY_SQL = "SELECT day, MAX(score) FROM daily_best WHERE day >= ? GROUP BY day ORDER BY day DESC"
+DAILY_BY_DIFFICULTY_SQL = ("SELECT day, score FROM daily_best WHERE day >= ? AND difficulty = ? "
+                           "ORDER BY day DESC")
+
+def day_of(timestamp):
+    # Local calendar day, as stored
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+class Leaderboard:
+    def __init__(self, path, top_n=10):
+        self.path = path
+        self.top_n = top_n
+        self.cache = {} # query key -> result; replaced as a whole, never edited
+        self.pending = set() # Keys queued for the worker
+        self.last_rank = None # Place of the last submitted run in its difficulty's top N (1-based)
+        self.submitted = 0
+        self.stored = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._worker = threading.Thread(target=self._run, name="leaderboard", daemon=True)
+        self._worker.start()
+
+    # --- Game loop side ---
+
+    def submit(self, score, difficulty, ticks=0, seed=0, played_at=None):
+        # Queues a finished run; last_rank is set once it's stored
+        played_at = time.time() if played_at is None else played_at
+        self.submitted += 1
+        self.last_rank = None
+        self._queue.put(("insert", (score, difficulty, day_of(played_at), played_at, ticks, seed)))
+
+    def top(self, difficulty=None, n=None):
+        # Best runs (all difficulties when None) as a tuple of Entry
+        return self._read(("top", difficulty, n or self.top_n))
+
+    def best(self, difficulty=None):
+        entries = self.top(difficulty)
+        if entries is None:
+            return None
+        return entries[0].score if entries else 0
+
+    def daily_best(self, days=7, difficulty=None):
+        # ((day, score), ...) for the last `days` days with runs, newest first
+        return self._read(("daily", difficulty, day_of(time.time() - (days - 1) * 86400)))
+
+    @property
+    def busy(self):
+        return self.stored < self.submitted
+
+    def _read(self, key):
+        cache = self.cache
+        if key in cache:
+            return cache[key]
+        with self._lock:
+            if key not in self.pending:
+                self.pending.add(key)
+                self._queue.put(("query", key))
+        return None
+
+    def close(self):
+        # Waits for queued writes
+        self._queue.put(None)
+        self._worker.join()
+
+    # --- Worker thread ---
+
+    def _run(self):
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL") # WAL: durable at checkpoints, never corrupt
+        db.executescript(SCHEMA)
+        try:
+            while True:
+                item = self._queue.get()
+                work = [item]
+                # Everything queued meanwhile goes in the same transaction
+                while item is not None:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    work.append(item)
+                inserts = [item[1] for item in work if item is not None and item[0] == "insert"]
+                queries = {item[1] for item in work if item is not None and item[0] == "query"}
+                if inserts:
+                    self._insert(db, inserts)
+                    # Invalidate: refresh everything cached plus what was asked for
+                    queries |= set(self.cache)
+                    cache = {key: self._query(db, key) for key in queries}
+                else:
+                    cache = dict(self.cache)
+                    cache.update((key, self._query(db, key)) for key in queries)
+                if inserts:
+                    self.last_rank = self._rank(db, inserts[-1])
+                self.cache = cache
+                with self._lock:
+                    self.pending -= queries
+                self.stored += len(inserts)
+                if work[-1] is None:
+                    break
+        finally:
+            db.close()
+
+    def _insert(self, db, runs):
+        with db:
+            db.executemany("INSERT INTO runs (score, difficulty, day, played_at, ticks, seed) "
+                           "VALUES (?, ?, ?, ?, ?, ?)", runs)
+            db.executemany("INSERT INTO daily_best (day, difficulty, score) VALUES (?, ?, ?) "
+                           "ON CONFLICT (day, difficulty) DO UPDATE SET score = MAX(score, excluded.score)",
+                           [(day, difficulty, score) for score, difficulty, day, *_ in runs])
+
+    def _query(self, db, key):
+        kind, difficulty, arg = key
+        if kind == "top":
+            if difficulty is None:
+                rows = db.execute(TOP_SQL, (arg,))
+            else:
+                rows = db.execute(TOP_BY_DIFFICULTY_SQL, (difficulty, arg))
+            return tuple(Entry._make(row) for row in rows)
+        if difficulty is None:
+            return tuple(db.execute(DAILY_SQL, (arg,)))
+        return tuple(db.execute(DAILY_BY_DIFFICULTY_SQL, (arg, difficulty)))
+
+    def _rank(self, db, run):
+        score, difficulty, _, played_at, _, seed = run
+        for place, entry in enumerate(self._query(db, ("top", difficulty, self.top_n)), 1):
+            if entry.score == score and entry.played_at == played_at and entry.seed == seed:
+                return place
+        return None
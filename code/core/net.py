@@ -0,0 +1,497 @@
+import asyncio
+import logging
+import queue
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+from .replay import SCHEDULE
+from .scheduler import SIM_KEYS, STATIC_SCHEDULE
+from .telemetry import STATE_IDS, PLAYER_STATES
+
+log = logging.getLogger(__name__)
+
+# Ghost racing: players race the same seeded obstacle stream and see each
+# other as ghosts. A small asyncio server starts races and relays player
+# states; the obstacles never go over the wire, since the seed, difficulty
+# and spawn schedule in the race announcement rebuild the exact stream in
+# every client's GameSim (as a replay does). Races spawn at the fixed
+# cadence of the difficulty: the schedule's ramp follows each player's own
+# score, so it would give every racer a different stream.
+#
+# The protocol is a stream of fixed-size records, each starting with its
+# kind byte. Player states are delta compressed: a FULL record carries the
+# absolute tick, position and pose; after it DELTA records carry the change
+# since the last record sent for that player, and players that didn't
+# change send nothing. TCP delivers every record in order, so the sender's
+# last record is always the receiver's baseline. The server keeps one
+# baseline per player shared by every client and writes the same bytes to
+# all of them (32 running players come to about 5 KB/s per client).
+#
+# Clients run the connection on a thread of their own; the game loop only
+# stores its latest state and reads the ghosts, so the network never adds
+# to a frame.
+VERSION = 1
+
+HELLO = 1 # version (client -> server)
+WELCOME = 2 # player id (server -> client)
+READY = 3 # wants to join the next race (client -> server)
+RACE = 4 # race id, seed, spawn_rate, speed min/max, spawn schedule (server -> participants)
+FULL = 5 # player id, tick, x, y, pose
+DELTA = 6 # player id, tick delta, x delta, y delta, pose
+FINISH = 7 # player id, tick, score
+LEAVE = 8 # player id (server -> clients)
+RECORDS = {
+    HELLO: struct.Struct("<BB"),
+    WELCOME: struct.Struct("<BB"),
+    READY: struct.Struct("<B"),
+    RACE: struct.Struct("<BHQIHH" + SCHEDULE.format[1:]),
+    FULL: struct.Struct("<BBIhhB"),
+    DELTA: struct.Struct("<BBBbbB"),
+    FINISH: struct.Struct("<BBII"),
+    LEAVE: struct.Struct("<BB"),
+}
+
+# Pose byte: player state id (core.telemetry) in the top three bits, the
+# frame of that state's clip in the low five
+POSE_FRAME_BITS = 5
+POSE_FRAME_MASK = (1 << POSE_FRAME_BITS) - 1
+
+def pose_of(player):
+    return STATE_IDS[player.state] << POSE_FRAME_BITS | min(player.clip_frame, POSE_FRAME_MASK)
+
+def unpack_pose(pose):
+    # (state name, frame index)
+    return PLAYER_STATES[pose >> POSE_FRAME_BITS], pose & POSE_FRAME_MASK
+
+class ProtocolError(ValueError):
+    pass
+
+def split_records(buffer):
+    # Parses the complete records at the start of buffer; returns
+    # ([(kind, values), ...], bytes consumed)
+    records = []
+    offset = 0
+    end = len(buffer)
+    while offset < end:
+        record = RECORDS.get(buffer[offset])
+        if record is None:
+            raise ProtocolError(f"unknown record kind {buffer[offset]}")
+        if end - offset < record.size:
+            break
+        values = record.unpack_from(buffer, offset)
+        records.append((values[0], values[1:]))
+        offset += record.size
+    return records, offset
+
+class Race:
+    # What a race is played on: GameSim.reset(seed) with these settings
+    # and schedule gives every participant the same obstacles
+    __slots__ = ("race_id", "seed", "settings", "schedule")
+
+    def __init__(self, race_id, seed, settings, schedule):
+        self.race_id = race_id
+        self.seed = seed
+        self.settings = {"spawn_rate": settings["spawn_rate"], "speed_range": list(settings["speed_range"])}
+        self.schedule = {key: schedule[key] for key in SIM_KEYS}
+
+    def to_bytes(self):
+        speed_min, speed_max = self.settings["speed_range"]
+        return RECORDS[RACE].pack(RACE, self.race_id, self.seed, int(self.settings["spawn_rate"]),
+                                  speed_min, speed_max, *(self.schedule[key] for key in SIM_KEYS))
+
+    @classmethod
+    def from_values(cls, values):
+        race_id, seed, spawn_rate, speed_min, speed_max, *schedule = values
+        return cls(race_id, seed, {"spawn_rate": spawn_rate, "speed_range": [speed_min, speed_max]},
+                   dict(zip(SIM_KEYS, schedule)))
+
+def new_race(race_id, seed, tuning):
+    # A race on the tuning's difficulty, without the score ramp
+    return Race(race_id, seed, tuning.settings, STATIC_SCHEDULE)
+
+class StateEncoder:
+    # Sender side of the delta compression: remembers the last state sent
+    # per player and encodes the next one against it
+    def __init__(self):
+        self.sent = {} # player id -> (tick, x, y, pose) as last sent
+
+    def encode(self, player_id, state, out):
+        # Appends the record for state (nothing if unchanged); returns out
+        base = self.sent.get(player_id)
+        if state == base:
+            return out
+        tick, x, y, pose = state
+        if base is not None:
+            dtick, dx, dy = tick - base[0], x - base[1], y - base[2]
+            if 0 <= dtick <= 0xFF and -128 <= dx <= 127 and -128 <= dy <= 127:
+                out.append(RECORDS[DELTA].pack(DELTA, player_id, dtick, dx, dy, pose))
+                self.sent[player_id] = state
+                return out
+        out.append(RECORDS[FULL].pack(FULL, player_id, tick, x, y, pose))
+        self.sent[player_id] = state
+        return out
+
+    def forget(self, player_id):
+        self.sent.pop(player_id, None)
+
+class StateDecoder:
+    # Receiver side: applies FULL / DELTA records to the per-player baselines
+    def __init__(self):
+        self.states = {} # player id -> (tick, x, y, pose)
+
+    def apply(self, kind, values):
+        # Returns (player id, absolute state)
+        player_id = values[0]
+        if kind == FULL:
+            state = values[1:]
+        else:
+            base = self.states.get(player_id)
+            if base is None:
+                raise ProtocolError(f"delta for player {player_id} without a baseline")
+            dtick, dx, dy, pose = values[1:]
+            state = (base[0] + dtick, base[1] + dx, base[2] + dy, pose)
+        self.states[player_id] = state
+        return player_id, state
+
+    def forget(self, player_id):
+        self.states.pop(player_id, None)
+
+def state_of(player, tick):
+    # Wire state of the local player: tick, position (whole pixels), pose
+    return (tick, int(player.x_position), int(player.y_position), pose_of(player))
+
+class Ghost:
+    # A remote player for drawing: the last two states received and when
+    # the newer one arrived. The ghost moves from the older position to
+    # the newer one over one send interval, so it shows one interval late
+    # but glides between updates.
+    __slots__ = ("player_id", "sample")
+
+    def __init__(self, player_id, state, now):
+        self.player_id = player_id
+        self.sample = (state, state, now) # Replaced as a whole by the network thread
+
+    def push(self, state, now):
+        self.sample = (self.sample[1], state, now)
+
+    def pose(self, now, interval):
+        # (x, y, state name, frame index) to draw at time now
+        prev, cur, arrived = self.sample
+        t = min(max((now - arrived) / interval, 0.0), 1.0)
+        state, frame = unpack_pose(cur[3])
+        return prev[1] + (cur[1] - prev[1]) * t, prev[2] + (cur[2] - prev[2]) * t, state, frame
+
+class RaceServer:
+    # Lobby and relay. A race starts start_delay seconds after the first
+    # READY (players readying up meanwhile join it) and once no earlier
+    # race is still running. The difficulty comes from config_service when
+    # the race starts, so config.json on the server decides it (and changes
+    # apply from the next race).
+    def __init__(self, send_hz=30, start_delay=2.0, max_players=32, seed=None):
+        self.interval = 1.0 / send_hz
+        self.start_delay = start_delay
+        self.max_players = max_players
+        self.rng = random.Random(seed)
+        self.writers = {} # player id -> StreamWriter
+        self.latest = {} # player id -> newest state from a running player
+        self.encoder = StateEncoder() # Shared baseline for the broadcast
+        self.ready = set()
+        self.running = set()
+        self.race_id = 0
+        self.starting = None # Countdown task
+        self.bytes_sent = 0
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        self.server = await asyncio.start_server(self._connection, host, port)
+        asyncio.get_running_loop().create_task(self._broadcast())
+        return self.server
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    def _free_id(self):
+        for player_id in range(1, self.max_players + 1):
+            if player_id not in self.writers:
+                return player_id
+        return None
+
+    async def _connection(self, reader, writer):
+        player_id = None
+        decoder = StateDecoder()
+        writer.transport.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            buffer = b""
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                records, used = split_records(buffer + data)
+                buffer = (buffer + data)[used:]
+                for kind, values in records:
+                    if player_id is None:
+                        if kind != HELLO or values[0] != VERSION:
+                            raise ProtocolError("expected a HELLO for protocol version "
+                                                f"{VERSION}, got kind {kind} {values}")
+                        player_id = self._join(writer)
+                        if player_id is None:
+                            return
+                    elif kind == READY:
+                        self.ready.add(player_id)
+                        self._maybe_start()
+                    elif kind in (FULL, DELTA):
+                        # Decoded even after finishing so the baseline stays in step
+                        _, state = decoder.apply(kind, values)
+                        if player_id in self.running:
+                            self.latest[player_id] = state
+                    elif kind == FINISH:
+                        self._finish(player_id, values[1], values[2])
+        except (ProtocolError, ConnectionError) as e:
+            log.warning("player %s dropped: %s", player_id, e)
+        finally:
+            if player_id is not None:
+                self._leave(player_id)
+            writer.close()
+
+    def _join(self, writer):
+        player_id = self._free_id()
+        if player_id is None:
+            log.warning("server full (%d players), refusing a connection", self.max_players)
+            return None
+        self.writers[player_id] = writer
+        # The newcomer gets every running player in full; from there the
+        # shared delta stream applies to its baselines too
+        out = [RECORDS[WELCOME].pack(WELCOME, player_id)]
+        for other, state in self.encoder.sent.items():
+            out.append(RECORDS[FULL].pack(FULL, other, *state))
+        writer.write(b"".join(out))
+        log.info("player %d joined (%d connected)", player_id, len(self.writers))
+        return player_id
+
+    def _finish(self, player_id, tick, score):
+        self.running.discard(player_id)
+        self.latest.pop(player_id, None)
+        self.encoder.forget(player_id)
+        self._send_all(RECORDS[FINISH].pack(FINISH, player_id, tick, score))
+        log.info("player %d finished race %d: score %d at tick %d", player_id, self.race_id, score, tick)
+        self._maybe_start()
+
+    def _leave(self, player_id):
+        self.writers.pop(player_id, None)
+        self.ready.discard(player_id)
+        self.running.discard(player_id)
+        self.latest.pop(player_id, None)
+        self.encoder.forget(player_id)
+        self._send_all(RECORDS[LEAVE].pack(LEAVE, player_id))
+        log.info("player %d left (%d connected)", player_id, len(self.writers))
+        self._maybe_start()
+
+    def _maybe_start(self):
+        if self.ready and not self.running and self.starting is None:
+            self.starting = asyncio.get_running_loop().call_later(self.start_delay, self._start_race)
+
+    def _start_race(self):
+        from .config import config_service
+        self.starting = None
+        participants = self.ready & set(self.writers)
+        self.ready = set()
+        if not participants:
+            return
+        config_service.apply()
+        tuning = config_service.tuning
+        self.race_id = (self.race_id + 1) & 0xFFFF
+        race = new_race(self.race_id, self.rng.getrandbits(63), tuning)
+        self.running = participants
+        data = race.to_bytes()
+        for player_id in participants:
+            self._send(player_id, data)
+        log.info("race %d started: %d players, difficulty %s, seed %d",
+                 race.race_id, len(participants), tuning.difficulty, race.seed)
+
+    def _send(self, player_id, data):
+        writer = self.writers.get(player_id)
+        if writer is None or writer.is_closing():
+            return
+        # A client that stopped reading would otherwise buffer without limit
+        if writer.transport.get_write_buffer_size() > 1 << 16:
+            log.warning("player %d isn't keeping up, disconnecting", player_id)
+            writer.close()
+            return
+        writer.write(data)
+        self.bytes_sent += len(data)
+
+    def _send_all(self, data):
+        for player_id in list(self.writers):
+            self._send(player_id, data)
+
+    async def _broadcast(self):
+        # Every interval: the changes since the last broadcast, same bytes to everyone
+        out = []
+        while True:
+            await asyncio.sleep(self.interval)
+            encode = self.encoder.encode
+            for player_id, state in self.latest.items():
+                encode(player_id, state, out)
+            if out:
+                self._send_all(b"".join(out))
+                out.clear()
+
+class NetClient:
+    # Connection to a RaceServer on a background thread. Game loop side:
+    # ready() to join the next race, take_race() to pick up the start,
+    # update() every tick while racing, finish() at game over, and ghosts
+    # for drawing. None of these wait on the network.
+    def __init__(self, host, port, send_hz=30):
+        self.host = host
+        self.port = port
+        self.interval = 1.0 / send_hz
+        self.player_id = None
+        self.connected = False
+        self.failed = False # Couldn't connect, or the connection dropped
+        self.ghosts = {} # player id -> Ghost; replaced as a whole, never edited
+        self.race = None # Latest race announcement not taken yet
+        self.local = None # Latest local state, sent every interval while set
+        self.bytes_received = 0
+        self._outbox = queue.SimpleQueue() # Records written with the next send
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="net-client", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    @property
+    def online(self):
+        return self.connected and not self.failed
+
+    # --- Game loop side ---
+
+    def ready(self):
+        self.race = None
+        self._outbox.put(RECORDS[READY].pack(READY))
+
+    def take_race(self):
+        race, self.race = self.race, None
+        return race
+
+    def update(self, player, tick):
+        self.local = state_of(player, tick)
+
+    def finish(self, tick, score):
+        # local is cleared first so no state follows the FINISH record
+        self.local = None
+        self._outbox.put(RECORDS[FINISH].pack(FINISH, self.player_id or 0, tick, score))
+
+    def close(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+
+    # --- Network thread ---
+
+    def _run(self):
+        try:
+            asyncio.run(self._main())
+        except (OSError, ProtocolError, asyncio.IncompleteReadError) as e:
+            log.warning("ghost racing: %s:%s unavailable (%s); playing solo", self.host, self.port, e)
+        self.failed = True
+        self.connected = False
+
+    async def _main(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.transport.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        writer.write(RECORDS[HELLO].pack(HELLO, VERSION))
+        receiver = asyncio.get_running_loop().create_task(self._receive(reader))
+        encoder = StateEncoder()
+        out = []
+        try:
+            while not self._stop.is_set() and not receiver.done():
+                await asyncio.sleep(self.interval)
+                while True:
+                    try:
+                        out.append(self._outbox.get_nowait())
+                    except queue.Empty:
+                        break
+                local = self.local
+                if local is not None and self.player_id is not None:
+                    encoder.encode(self.player_id, local, out)
+                if out:
+                    writer.write(b"".join(out))
+                    out.clear()
+                    await writer.drain()
+            if receiver.done():
+                receiver.result() # Re-raises what ended the connection
+        finally:
+            receiver.cancel()
+            writer.close()
+
+    async def _receive(self, reader):
+        decoder = StateDecoder()
+        buffer = b""
+        while True:
+            data = await reader.read(4096)
+            if not data:
+                raise ConnectionError("server closed the connection")
+            self.bytes_received += len(data)
+            records, used = split_records(buffer + data)
+            buffer = (buffer + data)[used:]
+            now = time.perf_counter()
+            ghosts = None # Copied on the first join/leave in this batch
+            for kind, values in records:
+                if kind in (FULL, DELTA):
+                    player_id, state = decoder.apply(kind, values)
+                    if player_id == self.player_id:
+                        continue
+                    ghost = (self.ghosts if ghosts is None else ghosts).get(player_id)
+                    if ghost is not None:
+                        ghost.push(state, now)
+                    else:
+                        if ghosts is None:
+                            ghosts = dict(self.ghosts)
+                        ghosts[player_id] = Ghost(player_id, state, now)
+                elif kind in (FINISH, LEAVE):
+                    decoder.forget(values[0])
+                    if values[0] in (self.ghosts if ghosts is None else ghosts):
+                        if ghosts is None:
+                            ghosts = dict(self.ghosts)
+                        del ghosts[values[0]]
+                elif kind == RACE:
+                    self.race = Race.from_values(values)
+                elif kind == WELCOME:
+                    self.player_id = values[0]
+                    self.connected = True
+                    log.info("ghost racing: joined %s:%s as player %d", self.host, self.port, self.player_id)
+            if ghosts is not None:
+                self.ghosts = ghosts
+
+def serve(host="127.0.0.1", port=7777, **options):
+    # Runs a RaceServer until interrupted
+    async def run():
+        race_server = RaceServer(**options)
+        server = await race_server.start(host, port)
+        log.info("ghost race server on %s:%d", host, race_server.port)
+        async with server:
+            await server.serve_forever()
+    asyncio.run(run())
+
+def main(argv=None):
+    # python -m core.net [host] [port] : run a race server (difficulty from config.json, live)
+    from .config import config_service
+    from .settings import MULTIPLAYER
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
+    args = sys.argv[1:] if argv is None else argv
+    host = args[0] if args else "0.0.0.0"
+    port = int(args[1]) if len(args) > 1 else MULTIPLAYER["port"]
+    config_service.watch()
+    try:
+        serve(host, port, send_hz=MULTIPLAYER["send_hz"], start_delay=MULTIPLAYER["start_delay_s"])
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
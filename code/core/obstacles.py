@@ -1,64 +1,231 @@
-import pygame
+import bisect
 import random
-from .settings import CURRENT_SETTINGS, SCREEN_WIDTH, GROUND_Y
+import numpy as np
+from .settings import CURRENT_SETTINGS, SCREEN_WIDTH, GROUND_Y, OBSTACLE_ARCHETYPES
 from .assets import game_assets
 
-def create_obstacle(player_x=None):
-    obstacle_type = random.choice(["car", "bird", "missile", "bomb"])
-    speed = random.randint(*CURRENT_SETTINGS["speed_range"])
-    
-    img = None
-    rect = None
-    y_speed = 0
-    
-    if obstacle_type == "car":
-        img = game_assets.car_img
-        rect = img.get_rect(midbottom=(SCREEN_WIDTH + 100, GROUND_Y + 80))
-        y_speed = 0
-    elif obstacle_type == "bird":
-        img = game_assets.bird_img
-        y_pos = random.randint(100, 300)
-        rect = img.get_rect(midbottom=(SCREEN_WIDTH + 100, y_pos))
-        y_speed = 0
-    elif obstacle_type == "missile":
-        img = game_assets.missile_img
-        y_pos = random.randint(300, 500)
-        rect = img.get_rect(midbottom=(SCREEN_WIDTH + 100, y_pos))
-        y_speed = 0
-    elif obstacle_type == "bomb":
-        img = game_assets.bomb_img
-        # Bomb spawns directly above player's current X
-        spawn_x = player_x if player_x is not None else 200
-        rect = img.get_rect(midbottom=(spawn_x, -50)) # Start above screen
-        y_speed = speed # Matches the speed of other obstacles (running speed)
-        speed = 0 # No X movement for bombs
-
-    return {"type": obstacle_type, "rect": rect, "img": img, "speed": speed, "y_speed": y_speed}
+SPAWN_X = SCREEN_WIDTH + 100
 
-def move_obstacles(obstacles, extra_speed=0):
-    score_increment = 0
-    for obstacle in obstacles[:]: 
-        
-        # Apply movement
-        # Horizontal (Speed + Scroll Effect from Rolling)
-        obstacle["rect"].x -= (obstacle["speed"] + extra_speed)
-        
-        # Vertical (Bombs)
-        if obstacle["type"] == "bomb":
-             obstacle["rect"].y += obstacle["y_speed"]
+class ObstacleTypes:
+    # Obstacle archetypes from config.json compiled into tables indexed by
+    # type id. Spawning is one weighted sample plus table reads, and
+    # ObstacleStore.move() applies per-type rules (despawn, score) to the
+    # whole batch as array ops instead of branching per obstacle.
+    #
+    # Archetype fields:
+    #   sprite, size, mode       -- asset file, scaled size, pixel mode
+    #   weight                   -- relative spawn frequency (integer)
+    #   score                    -- points when it leaves the screen
+    #   spawn.x                  -- "edge" (right of the screen) or "player" (above the player)
+    #   spawn.bottom             -- bottom y, or [min, max] for a random height
+    #   spawn.from_ground        -- bottom is measured down from ground_y
+    #   velocity.x / velocity.y  -- multiples of the difficulty speed (leftward / downward)
+    #   despawn_on_ground        -- removed once it falls below ground_y
+    SPAWN_X_RULES = ("edge", "player")
+
+    def __init__(self, archetypes):
+        if not archetypes:
+            raise ValueError("no obstacle types configured")
+        if len(archetypes) > 127:
+            raise ValueError("at most 127 obstacle types (type ids are stored as int8)")
+        self.names = tuple(archetypes)
+        self.sizes = []
+        self.cumulative_weights = []
+        self.at_player = []
+        self.bottoms = [] # (min, max)
+        self.vx_scales = []
+        self.vy_scales = []
+        self.floor_y = []
+        score = []
+        total = 0
+        for name, archetype in archetypes.items():
+            weight = archetype.get("weight", 1)
+            if not isinstance(weight, int) or weight < 0:
+                raise ValueError(f"obstacle {name!r}: weight must be a non-negative integer")
+            total += weight
+            self.cumulative_weights.append(total)
+            self.sizes.append(tuple(archetype["size"]))
+
+            spawn = archetype.get("spawn", {})
+            x_rule = spawn.get("x", "edge")
+            if x_rule not in self.SPAWN_X_RULES:
+                raise ValueError(f"obstacle {name!r}: spawn x must be one of {self.SPAWN_X_RULES}, got {x_rule!r}")
+            self.at_player.append(x_rule == "player")
+            bottom = spawn.get("bottom", GROUND_Y)
+            low, high = bottom if isinstance(bottom, list) else (bottom, bottom)
+            if spawn.get("from_ground", False):
+                low, high = GROUND_Y + low, GROUND_Y + high
+            self.bottoms.append((low, high))
+
+            velocity = archetype.get("velocity", {})
+            self.vx_scales.append(velocity.get("x", 1))
+            self.vy_scales.append(velocity.get("y", 0))
+            score.append(archetype.get("score", 0))
+            self.floor_y.append(float(GROUND_Y) if archetype.get("despawn_on_ground", False) else np.inf)
+        if total == 0:
+            raise ValueError("obstacle spawn weights add up to zero")
+        self.total_weight = total
+        self.score = np.array(score, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.names)
+
+    def sample(self, rng):
+        # Weighted pick; with equal weights this draws exactly what
+        # rng.randrange(len(types)) would, so seeds keep their streams
+        return bisect.bisect_right(self.cumulative_weights, rng.randrange(self.total_weight))
+
+OBSTACLE_TYPES = ObstacleTypes(OBSTACLE_ARCHETYPES)
+
+def obstacle_images():
+    # Indexed by type id
+    return game_assets.obstacle_images
+
+def obstacle_masks():
+    # Indexed by type id
+    return tuple(game_assets.get_mask(img) for img in obstacle_images())
+
+class ObstacleStore:
+    # Structure-of-arrays obstacle storage. Slots [0, count) are live;
+    # removal swaps survivors from the tail into the holes so the live
+    # range stays dense and every per-frame pass is a single array op.
+    # Slots are preallocated and recycled (capacity only ever doubles), and
+    # move() works in preallocated scratch buffers, so steady-state ticks
+    # allocate no arrays.
+    # floor_y: y past which the obstacle despawns, copied from its type at
+    # spawn (ground_y or +inf) so move() tests all types in one comparison
+    FLOAT_FIELDS = ("x", "y", "w", "h", "vx", "vy", "floor_y", "prev_x", "prev_y")
+
+    def __init__(self, capacity=64, types=None):
+        self.types = types if types is not None else OBSTACLE_TYPES
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        old_count = self.count
+        for name in self.FLOAT_FIELDS:
+            arr = np.zeros(capacity, dtype=np.float64)
+            if old_count:
+                arr[:old_count] = getattr(self, name)[:old_count]
+            setattr(self, name, arr)
+        type_id = np.zeros(capacity, dtype=np.int8)
+        if old_count:
+            type_id[:old_count] = self.type_id[:old_count]
+        self.type_id = type_id
+        # Scratch space for move(), contents don't survive a call
+        self._scratch = np.empty(capacity, dtype=np.float64)
+        self._dead = np.empty(capacity, dtype=bool)
+        self._landed = np.empty(capacity, dtype=bool)
+        self.capacity = capacity
+
+    def _arrays(self):
+        return [getattr(self, name) for name in self.FLOAT_FIELDS] + [self.type_id]
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def add(self, type_id, x, y, w, h, vx, vy):
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        i = self.count
+        self.type_id[i] = type_id
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.w[i] = w
+        self.h[i] = h
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.floor_y[i] = self.types.floor_y[type_id]
+        self.count += 1
+        return i
+
+    def move(self, extra_speed=0):
+        n = self.count
+        if n == 0:
+            return 0
+        x = self.x[:n]
+        y = self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+
+        scratch = self._scratch[:n]
+        dead = self._dead[:n]
+
+        # Horizontal (Speed + Scroll Effect from Rolling), vertical (Bombs, 0 for the rest)
+        np.add(self.vx[:n], extra_speed, out=scratch)
+        x -= scratch
+        y += self.vy[:n]
 
         # Removal Checks
         # 1. Went off screen to the left (applicable to all if scrolling fast)
-        if obstacle["rect"].right < 0:
-            obstacles.remove(obstacle)
-            score_increment += 10
-        # 2. Bomb hit the ground
-        elif obstacle["type"] == "bomb" and obstacle["rect"].top > GROUND_Y:
-            obstacles.remove(obstacle)
-            score_increment += 10
-                 
-    return score_increment
-
-def draw_obstacles(screen, obstacles):
-    for obstacle in obstacles:
-        screen.blit(obstacle["img"], obstacle["rect"])
+        np.add(x, self.w[:n], out=scratch)
+        np.less(scratch, 0, out=dead)
+        # 2. Types that despawn on the ground (bombs) reached it
+        landed = self._landed[:n]
+        np.greater(y, self.floor_y[:n], out=landed)
+        dead |= landed
+        removed = int(np.count_nonzero(dead))
+        if not removed:
+            return 0
+        score = int(self.types.score[self.type_id[:n][dead]].sum())
+        self._compact(dead, removed)
+        return score
+
+    def _compact(self, dead, removed):
+        # Swap-remove: live slots past the new end fill the holes before it
+        new_count = self.count - removed
+        holes = np.flatnonzero(dead[:new_count])
+        if len(holes):
+            movers = np.flatnonzero(~dead[new_count:]) + new_count
+            for arr in self._arrays():
+                arr[holes] = arr[movers]
+        self.count = new_count
+
+    def overlaps(self, rect):
+        # Boolean mask of live obstacles overlapping a pygame.Rect
+        n = self.count
+        x = self.x[:n]
+        y = self.y[:n]
+        return ((x < rect.right) & (x + self.w[:n] > rect.left) &
+                (y < rect.bottom) & (y + self.h[:n] > rect.top))
+
+def create_obstacle(obstacles, player_x=None, rng=random, settings=None):
+    settings = settings if settings is not None else CURRENT_SETTINGS
+    types = obstacles.types
+    type_id = types.sample(rng)
+    speed = rng.randint(*settings["speed_range"])
+    w, h = types.sizes[type_id]
+
+    if types.at_player[type_id]:
+        # Spawns directly above player's current X
+        center_x = player_x if player_x is not None else 200
+    else:
+        center_x = SPAWN_X
+    low, high = types.bottoms[type_id]
+    bottom = rng.randint(low, high) if high != low else low
+
+    # Same placement as img.get_rect(midbottom=...)
+    return obstacles.add(type_id, int(center_x) - w // 2, bottom - h, w, h,
+                         speed * types.vx_scales[type_id], speed * types.vy_scales[type_id])
+
+def move_obstacles(obstacles, extra_speed=0):
+    return obstacles.move(extra_speed)
+
+def draw_obstacles(screen, obstacles, alpha=1.0):
+    # Returns the screen areas drawn
+    n = obstacles.count
+    if n == 0:
+        return []
+    images = obstacle_images()
+    xs = obstacles.x[:n]
+    ys = obstacles.y[:n]
+    if alpha < 1.0:
+        # Interpolate between the last two simulation ticks
+        xs = obstacles.prev_x[:n] + (xs - obstacles.prev_x[:n]) * alpha
+        ys = obstacles.prev_y[:n] + (ys - obstacles.prev_y[:n]) * alpha
+    blit = screen.blit
+    return [blit(images[type_id], (x, y))
+            for type_id, x, y in zip(obstacles.type_id[:n].tolist(), xs.tolist(), ys.tolist())]
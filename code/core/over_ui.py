@@ -1,18 +1,33 @@
 import pygame
 from .settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from .text_cache import text_cache, DigitAtlas
+from .pool import surface_pool
 
 class GameOverUI:
     def __init__(self):
-        self.large_font = pygame.font.Font(None, 80)
-        self.medium_font = pygame.font.Font(None, 50)
-        self.small_font = pygame.font.Font(None, 30)
+        self.large_size = 80
+        self.small_size = 30
+        self.score_atlas = DigitAtlas(50, (255, 255, 255), "Score: ")
+        
+        # Flashing title: rendered once in white, tinted into a pooled surface
+        # each frame (same pixels as rendering it in the flash color)
+        self.title_white = text_cache.render("GAME OVER", self.large_size, (255, 255, 255))
+        self.title = surface_pool.acquire(self.title_white.get_size(), pygame.SRCALPHA)
+        self.title_rect = self.title_white.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
         
         self.play_again_rect = pygame.Rect(SCREEN_WIDTH // 2 - 120, SCREEN_HEIGHT // 2 + 50, 240, 60)
 
-    def draw(self, screen, score):
-        # Translucent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
+        # Leaderboard panel (right side): title and up to board_rows runs
+        self.board_rows = 5
+        self.board_rect = pygame.Rect(SCREEN_WIDTH * 3 // 4 - 150, SCREEN_HEIGHT // 3 - 40, 300, 60 + 40 * self.board_rows)
+
+    def draw(self, screen, score, top=None, rank=None):
+        # top: leaderboard entries for the current difficulty (None while
+        # loading), rank: place of this run among them.
+        # Returns the areas that change from frame to frame (flashing title,
+        # hover button, leaderboard filling in)
+        # Translucent overlay (built once, shared through the pool)
+        overlay = surface_pool.filled((SCREEN_WIDTH, SCREEN_HEIGHT), (0, 0, 0, 180), pygame.SRCALPHA)
         screen.blit(overlay, (0, 0))
         
         # Game Over Text
@@ -20,14 +35,12 @@ class GameOverUI:
         ticks = pygame.time.get_ticks()
         color_g = 50 + (ticks % 500) // 5 
         
-        text_surf = self.large_font.render("GAME OVER", True, (255, color_g, 50))
-        text_rect = text_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
-        screen.blit(text_surf, text_rect)
+        self.title.fill((255, color_g, 50, 255))
+        self.title.blit(self.title_white, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        title_area = screen.blit(self.title, self.title_rect)
         
         # Score
-        score_surf = self.medium_font.render(f"Score: {score}", True, (255, 255, 255))
-        score_rect = score_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))
-        screen.blit(score_surf, score_rect)
+        self.score_atlas.draw(screen, score, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))
         
         # Play Again Button
         mouse_pos = pygame.mouse.get_pos()
@@ -36,10 +49,25 @@ class GameOverUI:
         pygame.draw.rect(screen, (150, 30, 30), self.play_again_rect.move(0, 5), border_radius=10)
         pygame.draw.rect(screen, color, self.play_again_rect, border_radius=10)
         
-        btn_text = self.small_font.render("PLAY AGAIN", True, (255, 255, 255))
+        btn_text = text_cache.render("PLAY AGAIN", self.small_size, (255, 255, 255))
         btn_text_rect = btn_text.get_rect(center=self.play_again_rect.center)
         screen.blit(btn_text, btn_text_rect)
 
+        self._draw_board(screen, top, rank)
+        return [title_area, self.play_again_rect.union(self.play_again_rect.move(0, 5)), self.board_rect]
+
+    def _draw_board(self, screen, top, rank):
+        if top is None and rank is None:
+            return
+        x, y = self.board_rect.centerx, self.board_rect.top
+        header = "NEW BEST!" if rank == 1 else "TOP SCORES"
+        text = text_cache.render(header, self.small_size + 10, (255, 215, 0))
+        screen.blit(text, text.get_rect(midtop=(x, y)))
+        for place, entry in enumerate((top or ())[:self.board_rows], 1):
+            color = (255, 215, 0) if place == rank else (255, 255, 255)
+            text = text_cache.render(f"{place}.  {entry.score}", self.small_size, color)
+            screen.blit(text, text.get_rect(midtop=(x, y + 20 + 40 * place)))
+
     def check_click(self, pos):
         if self.play_again_rect.collidepoint(pos):
             return True
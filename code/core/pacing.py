@@ -0,0 +1,86 @@
+import time
+import pygame
+
+# Frame pacing: ends each frame at the refresh target and returns the real
+# time the frame took, which the fixed-step simulation turns into ticks.
+# Movement lives in the simulation (per 60 Hz tick, interpolated for
+# drawing), so the target only changes how often the picture is drawn,
+# never how fast the game runs.
+#
+# Modes:
+#   sleep  -- Clock.tick(): OS sleep, cheap but coarse
+#   busy   -- Clock.tick_busy_loop(): spins the whole wait
+#   hybrid -- sleeps until spin_ms before the deadline, then spins on
+#             perf_counter; low jitter without burning the whole frame
+#   vsync  -- the display's vertical sync paces the flip; only measures
+# Targets are frames per second; 0 is uncapped. Clock works in whole
+# milliseconds (60 Hz becomes 16 ms frames, 62.5 Hz); hybrid keeps the
+# exact period.
+
+PACING_MODES = ("sleep", "busy", "hybrid", "vsync")
+PACING_TARGETS = (60, 120, 144, 0)
+
+class FramePacer:
+    def __init__(self, target_fps=60, mode="hybrid", spin_ms=2.0):
+        if mode not in PACING_MODES:
+            raise ValueError(f"unknown pacing mode {mode!r}, expected one of {PACING_MODES}")
+        if target_fps not in PACING_TARGETS:
+            raise ValueError(f"unsupported refresh target {target_fps!r}, expected one of {PACING_TARGETS}")
+        self.target_fps = target_fps
+        self.mode = mode
+        self.period_ns = int(1e9 / target_fps) if target_fps else 0
+        self.spin_ns = int(spin_ms * 1e6)
+        self.clock = pygame.time.Clock()
+        self.deadline = None # Hybrid: when the current frame should end
+        self.last = None
+        self.late_frames = 0 # Frames that overran the target period
+
+    def tick(self):
+        # Waits out the rest of the frame; returns the frame time in ms
+        if self.mode == "sleep":
+            frame_ms = self.clock.tick(self.target_fps)
+        elif self.mode == "busy":
+            frame_ms = self.clock.tick_busy_loop(self.target_fps)
+        elif self.mode == "vsync":
+            frame_ms = self.clock.tick()
+        else:
+            frame_ms = self._hybrid()
+        if self.period_ns and frame_ms * 1e6 > self.period_ns * 1.5:
+            self.late_frames += 1
+        return frame_ms
+
+    def _hybrid(self):
+        now = time.perf_counter_ns()
+        if self.last is None:
+            self.last = self.deadline = now
+        if self.period_ns:
+            # Deadlines advance by whole periods so sleep overshoot doesn't
+            # accumulate; after a long stall the schedule restarts from now
+            self.deadline += self.period_ns
+            if now - self.deadline > self.period_ns:
+                self.deadline = now
+            remaining = self.deadline - now
+            if remaining > self.spin_ns:
+                time.sleep((remaining - self.spin_ns) / 1e9)
+            while time.perf_counter_ns() < self.deadline:
+                pass
+            now = time.perf_counter_ns()
+        frame_ms = (now - self.last) / 1e6
+        self.last = now
+        return frame_ms
+
+def open_display(size, pacing):
+    # set_mode() for the pacing settings; returns (screen, FramePacer).
+    # VSync needs a renderer-backed window (SCALED); where the driver
+    # can't provide it the pacer falls back to hybrid timing.
+    mode = pacing["mode"]
+    if mode == "vsync":
+        try:
+            screen = pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+        except pygame.error as e:
+            print(f"VSync unavailable ({e}); pacing with hybrid timing")
+            mode = "hybrid"
+        else:
+            return screen, FramePacer(pacing["target_fps"], mode, pacing["spin_ms"])
+    screen = pygame.display.set_mode(size)
+    return screen, FramePacer(pacing["target_fps"], mode, pacing["spin_ms"])
@@ -1,17 +1,45 @@
 import pygame
-from .settings import (
-    GROUND_Y, X_POSITION, ANIMATION_SPEED, JUMP_FRAME_DURATION, GRAVITY,
-    JUMP_VELOCITY, JUMP_HORIZONTAL_SPEED, EXTRA_FORCE_HOLDING, MAX_HOLD_TIME,
-    MAX_JUMP_HEIGHT, MAX_FORWARD_DISPLACEMENT, ROLL_SPEED, ROLL_FRAME_DURATION
-)
+from .settings import GROUND_Y, X_POSITION, ANIMATION_SPEED, ROLL_SPEED, ROLL_FRAME_DURATION
+from .config import config_service
 from .assets import game_assets
+from .animation import Clip, ThresholdClip
+
+ROLL_OFFSET = 45 # Offset to align roll (ht 90) with standing (ht 180) bottom
+SPRITE_Y_OFFSET = 10 # Sprites are centered slightly below the player's position
+
+# Jump arc by vertical velocity: launch (< -10), rise (< -4), peak (< 2),
+# fall (< 10), landing. Short presses only reach the early frames.
+JUMP_VELOCITY_THRESHOLDS = (-10, -4, 2, 10)
+
+_clips = None
+
+def player_clips():
+    # Built once from the packed player atlas, shared by every Player
+    global _clips
+    if _clips is None:
+        anchor = (0, SPRITE_Y_OFFSET)
+        jump_frames = game_assets.jump_frames
+        _clips = {
+            "stand": Clip([game_assets.standing_surface], anchor=anchor),
+            "run": Clip(game_assets.run_frames, ANIMATION_SPEED, anchor=anchor),
+            # Frames 3,4,5 (indices 2..4) loop; the first two are the wind-up
+            "roll": Clip(game_assets.roll_frames, ROLL_FRAME_DURATION, loop=(2, 4),
+                         anchor=(0, SPRITE_Y_OFFSET + ROLL_OFFSET)),
+            # Fewer than five frames: hold the first one for the whole jump
+            "jump": ThresholdClip(jump_frames, JUMP_VELOCITY_THRESHOLDS if len(jump_frames) >= 5 else (),
+                                  anchor=anchor),
+        }
+    return _clips
 
 class Player:
     def __init__(self):
         self.state = "idle"  # idle, ready, jump, roll, run
         self.y_position = GROUND_Y
         self.rect = None
+        # One Rect reused for every update; callers copy it if they keep it across ticks
+        self._rect = pygame.Rect(0, 0, 0, 0)
         self.frame_index = 0
+        self.clip_frame = 0 # Frame of the clip shown by the last update (sent to ghost racing peers)
         self.animation_timer = 0
         self.last_update = 0
         self.jump_start_time = 0
@@ -19,24 +47,36 @@ class Player:
         self.vel_x = 0
         self.x_position = X_POSITION
         self.current_img = None
-        self.roll_offset = 45 # Offset to align roll (ht 90) with standing (ht 180) bottom
+        self.clips = None # player_clips(), resolved on the first update
+        self.prev_center = None # Rect center before the last update (render interpolation)
 
-    def reset(self):
+    def reset(self, current_time=None):
         self.state = "ready"
         self.y_position = GROUND_Y
         self.x_position = X_POSITION
         self.frame_index = 0
         self.vel_y = 0
         self.vel_x = 0
-        self.last_update = pygame.time.get_ticks()
+        # Simulation passes its own clock; fall back to wall-clock ticks
+        self.last_update = pygame.time.get_ticks() if current_time is None else current_time
         self.initial_jump_y = GROUND_Y
+        self.rect = None
+        self.prev_center = None
 
     def get_current_surface(self):
          return self.current_img
 
-    def update(self, keys):
-        current_surface = None
-        current_time = pygame.time.get_ticks()
+    def update(self, keys, current_time=None):
+        clip = None
+        index = 0
+        clips = self.clips
+        if clips is None:
+            clips = self.clips = player_clips()
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
+        # Physics values in effect this tick (hot-reloadable)
+        tuning = config_service.tuning
+        self.prev_center = self.rect.center if self.rect else None
         
         # State Management
         if self.state == "idle":
@@ -46,12 +86,12 @@ class Player:
         if self.state in ["ready", "run"]:
             if keys[pygame.K_RIGHT]:
                 self.state = "roll"
-                self.frame_index = 2 # Start directly at loop frames (roll3)
+                self.frame_index = clips["roll"].start # Start directly at loop frames (roll3)
                 self.last_update = current_time
             elif keys[pygame.K_UP]:
                 self.state = "jump"
-                self.vel_y = JUMP_VELOCITY
-                self.vel_x = JUMP_HORIZONTAL_SPEED
+                self.vel_y = tuning.jump_velocity
+                self.vel_x = tuning.jump_horizontal_speed
                 self.jump_start_time = current_time
                 self.initial_jump_y = self.y_position
             elif keys[pygame.K_LEFT]:
@@ -67,7 +107,7 @@ class Player:
                  # Stay idle/stopped
                  self.vel_x = 0
                  # Use standing/idle frame
-                 current_surface = game_assets.standing_surface
+                 clip = clips["stand"]
             else:
                  self.state = "ready"
         
@@ -76,21 +116,14 @@ class Player:
              if keys[pygame.K_RIGHT]:
                  # Continuous Roll
                  self.vel_x = ROLL_SPEED
-                 # self.x_position += self.vel_x 
                  self.y_position = GROUND_Y # Lock Y to ground
                  
                  # Loop Animation (Frames 3,4,5 -> indices 2,3,4)
-                 if current_time - self.last_update > ROLL_FRAME_DURATION:
-                     self.frame_index += 1
-                     if self.frame_index > 4: # Loop back to 2 after 4
-                         self.frame_index = 2
+                 clip = clips["roll"]
+                 if current_time - self.last_update > clip.frame_ms:
+                     self.frame_index = clip.next_frame[self.frame_index]
                      self.last_update = current_time
-                 
-                 # Safety check for index
-                 if self.frame_index < 2 or self.frame_index > 4:
-                     self.frame_index = 2
-                     
-                 current_surface = game_assets.roll_frames[self.frame_index] if game_assets.roll_frames else None
+                 index = self.frame_index
              else:
                  # Key released, exit roll immediately
                  self.state = "ready"
@@ -104,13 +137,13 @@ class Player:
             
             # Additional force while holding UP
             if keys[pygame.K_UP]:
-                if time_since_jump < MAX_HOLD_TIME:
+                if time_since_jump < tuning.max_hold_time:
                      current_height = self.initial_jump_y - self.y_position
-                     if current_height < MAX_JUMP_HEIGHT:
-                         self.vel_y += EXTRA_FORCE_HOLDING
+                     if current_height < tuning.max_jump_height:
+                         self.vel_y += tuning.extra_force_holding
             
             # Physics
-            self.vel_y += GRAVITY
+            self.vel_y += tuning.gravity
             self.y_position += self.vel_y
             # self.x_position += JUMP_HORIZONTAL_SPEED # Handled by background scroll
             
@@ -120,59 +153,51 @@ class Player:
                 self.state = "ready"
                 self.vel_y = 0
             
-            # Animation Sync (Variable Height Jump logic for frames)
-            # Sync rule: short press (1-3), long press (1-5).
-            # We approximate this by mapping vertical velocity to frames, 
-            # which naturally reflects the jump arc.
-            # Frames 1-5. 
-            # 1: Launch (-16), 2: Rise, 3: Peak/High Rise, 4: Fall Start, 5: Land
-            if game_assets.jump_frames:
-                frame_count = len(game_assets.jump_frames)
-                if frame_count >= 5:
-                    if self.vel_y < -10: idx = 0 # Launch
-                    elif self.vel_y < -4: idx = 1 # Rise
-                    elif self.vel_y < 2:  idx = 2 # Peak (approx 0)
-                    elif self.vel_y < 10: idx = 3 # Fall
-                    else: idx = 4 # Landing
-                    
-                    # Clamp index
-                    idx = max(0, min(idx, frame_count - 1))
-                    current_surface = game_assets.jump_frames[idx]
-                else:
-                    current_surface = game_assets.jump_frames[0]
+            # Animation Sync: vertical velocity picks the frame from the
+            # jump arc table, which naturally follows variable-height jumps
+            clip = clips["jump"]
+            index = clip.index(self.vel_y)
 
         # READY/RUN STATE (Fallback)
         if self.state in ["ready", "run"]:
              # Run Animation
-             if current_time - self.last_update > ANIMATION_SPEED:
-                 self.frame_index = (self.frame_index + 1) % len(game_assets.run_frames)
+             clip = clips["run"]
+             if current_time - self.last_update > clip.frame_ms:
+                 self.frame_index = clip.next_frame[self.frame_index]
                  self.last_update = current_time
-             
-             if game_assets.run_frames:
-                 current_surface = game_assets.run_frames[self.frame_index]
+             index = self.frame_index
              
              # Movement Clamp/Reset in Ready
              # Actually 'ready' implies running on ground in this game.
              self.y_position = GROUND_Y
         
         # Clamp Forward Position
-        max_x = X_POSITION + MAX_FORWARD_DISPLACEMENT
+        max_x = X_POSITION + tuning.max_forward_displacement
         if self.x_position > max_x:
             self.x_position = max_x
             
-        # Determine Rect
-        if current_surface:
-             self.current_img = current_surface
-             # If rolling, shift center Y down to align bottom
-             draw_y = self.y_position
-             if self.state == "roll":
-                 draw_y += self.roll_offset
-                 
-             self.rect = current_surface.get_rect(center=(int(self.x_position), int(draw_y+10)))
-             return current_surface, self.rect
+        # Place the frame by its anchor, reusing one Rect
+        if clip is not None:
+             self.current_img = clip.frames[index]
+             self.clip_frame = index
+             anchor_x, anchor_y = clip.anchors[index]
+             rect = self._rect
+             rect.size = clip.sizes[index]
+             rect.center = (int(self.x_position + anchor_x), int(self.y_position + anchor_y))
+             self.rect = rect
+             return self.current_img, self.rect
             
         return None, None
     
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
+        # Returns the screen area drawn (None if nothing was drawn)
         if self.current_img and self.rect:
-            screen.blit(self.current_img, self.rect)
+            if self.prev_center is None or alpha >= 1.0:
+                return screen.blit(self.current_img, self.rect)
+            # Interpolate between the last two simulation ticks
+            px, py = self.prev_center
+            cx, cy = self.rect.center
+            x = px + (cx - px) * alpha - self.rect.width / 2
+            y = py + (cy - py) * alpha - self.rect.height / 2
+            return screen.blit(self.current_img, (x, y))
+        return None
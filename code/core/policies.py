@@ -0,0 +1,52 @@
+import random
+from .simulation import INPUT_UP, INPUT_RIGHT, INPUT_LEFT
+
+# Input policies for headless runs: called once per tick with the
+# simulation, return the input bitmask for that tick.
+
+class IdlePolicy:
+    name = "idle"
+
+    def __init__(self, seed=None):
+        pass
+
+    def __call__(self, sim):
+        return 0
+
+class RandomPolicy:
+    # Holds a random key combination for a random number of ticks
+    name = "random"
+    CHOICES = (0, 0, 0, INPUT_UP, INPUT_RIGHT, INPUT_LEFT)
+
+    def __init__(self, seed=None, min_hold=5, max_hold=40):
+        self.rng = random.Random(seed)
+        self.min_hold = min_hold
+        self.max_hold = max_hold
+        self.mask = 0
+        self.hold = 0
+
+    def __call__(self, sim):
+        if self.hold <= 0:
+            self.mask = self.rng.choice(self.CHOICES)
+            self.hold = self.rng.randint(self.min_hold, self.max_hold)
+        self.hold -= 1
+        return self.mask
+
+class JumperPolicy:
+    # Scripted: jump when an obstacle is about to reach the player
+    name = "jumper"
+
+    def __init__(self, seed=None, reaction_px=220):
+        self.reaction_px = reaction_px
+
+    def __call__(self, sim):
+        player = sim.player
+        obstacles = sim.obstacles
+        n = obstacles.count
+        if n == 0 or player.rect is None or player.state == "jump":
+            return 0
+        gap = obstacles.x[:n] - player.rect.right
+        ahead = (gap > -player.rect.width) & (gap < self.reaction_px)
+        return INPUT_UP if ahead.any() else 0
+
+POLICIES = {policy.name: policy for policy in (IdlePolicy, RandomPolicy, JumperPolicy)}
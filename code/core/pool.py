@@ -0,0 +1,40 @@
+import pygame
+
+class SurfacePool:
+    # Reusable surfaces keyed by (size, flags), so per-frame and
+    # periodically rebuilt layers recycle their pixel buffers instead of
+    # allocating a new Surface each time.
+    #
+    # acquire()/release() hand out scratch surfaces with undefined contents
+    # (callers fill them completely). filled() returns a shared, read-only
+    # solid-color surface, e.g. a translucent full-screen overlay.
+    def __init__(self, max_free=4):
+        self.max_free = max_free # Spare surfaces kept per key
+        self.free = {} # (size, flags) -> [Surface]
+        self.solid = {} # (size, color, flags) -> Surface
+
+    def acquire(self, size, flags=0):
+        spares = self.free.get((tuple(size), flags))
+        if spares:
+            return spares.pop()
+        return pygame.Surface(size, flags)
+
+    def release(self, surface):
+        key = (surface.get_size(), surface.get_flags() & pygame.SRCALPHA)
+        spares = self.free.setdefault(key, [])
+        if len(spares) < self.max_free:
+            spares.append(surface)
+
+    def filled(self, size, color, flags=0):
+        key = (tuple(size), tuple(color), flags)
+        surface = self.solid.get(key)
+        if surface is None:
+            surface = self.solid[key] = pygame.Surface(size, flags)
+            surface.fill(color)
+        return surface
+
+    def clear(self):
+        self.free.clear()
+        self.solid.clear()
+
+surface_pool = SurfacePool()
@@ -0,0 +1,164 @@
+import json
+import os
+import time
+from array import array
+import pygame
+from .pool import surface_pool
+
+# Frame-phase timing. Scopes are reused objects and samples go into fixed
+# ring buffers, so an enabled profiler costs two perf_counter_ns() calls
+# and a couple of list stores per scope; disabled, scope() hands back a
+# shared no-op. The trace is a preallocated ring too, so recording keeps
+# no new objects alive and never feeds the garbage collector.
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, self.start, time.perf_counter_ns())
+        return False
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_SCOPE = _NullScope()
+
+class Profiler:
+    def __init__(self, window=300, trace_capacity=200000):
+        self.enabled = False
+        self.window = window
+        self.scopes = {}
+        self.samples = {} # name -> [ring buffer of ns, next index, filled]
+        self.order = [] # names in first-seen order, for the overlay
+        # Trace ring: event i is (trace_names[i], trace_starts[i], trace_durations[i])
+        self.trace_capacity = trace_capacity
+        self.trace_names = [None] * trace_capacity
+        self.trace_starts = array("q", bytes(8 * trace_capacity))
+        self.trace_durations = array("q", bytes(8 * trace_capacity))
+        self.trace_next = 0
+        self.trace_count = 0
+        self.origin_ns = time.perf_counter_ns()
+
+        self.overlay_visible = False
+        self.overlay_interval_ms = 250
+        self.overlay_surface = None
+        self.overlay_updated = -self.overlay_interval_ms
+        self.font = None
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def scope(self, name):
+        if not self.enabled:
+            return NULL_SCOPE
+        scope = self.scopes.get(name)
+        if scope is None:
+            scope = self.scopes[name] = _Scope(self, name)
+        return scope
+
+    def add(self, name, start_ns, end_ns):
+        duration = end_ns - start_ns
+        entry = self.samples.get(name)
+        if entry is None:
+            entry = self.samples[name] = [array("q", bytes(8 * self.window)), 0, 0]
+            self.order.append(name)
+        buf, index, filled = entry
+        buf[index] = duration
+        entry[1] = (index + 1) % self.window
+        if filled < self.window:
+            entry[2] = filled + 1
+        i = self.trace_next
+        self.trace_names[i] = name
+        self.trace_starts[i] = start_ns
+        self.trace_durations[i] = duration
+        self.trace_next = (i + 1) % self.trace_capacity
+        if self.trace_count < self.trace_capacity:
+            self.trace_count += 1
+
+    def trace_events(self):
+        # (name, start_ns, duration_ns), oldest first
+        first = (self.trace_next - self.trace_count) % self.trace_capacity
+        for k in range(self.trace_count):
+            i = (first + k) % self.trace_capacity
+            yield self.trace_names[i], self.trace_starts[i], self.trace_durations[i]
+
+    def percentiles(self, name, qs=(0.5, 0.95, 0.99)):
+        # Milliseconds over the rolling window
+        entry = self.samples.get(name)
+        if entry is None or not entry[2]:
+            return tuple(0.0 for _ in qs)
+        values = sorted(entry[0][:entry[2]])
+        last = len(values) - 1
+        return tuple(values[min(last, int(q * len(values)))] / 1e6 for q in qs)
+
+    def report(self):
+        return {name: dict(zip(("p50", "p95", "p99"), self.percentiles(name))) for name in self.order}
+
+    # --- Overlay ---
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.enabled = True
+            self.overlay_updated = -self.overlay_interval_ms
+
+    def draw_overlay(self, screen):
+        # Returns the screen area drawn (None when hidden)
+        if not self.overlay_visible:
+            return None
+        now = pygame.time.get_ticks()
+        # Re-rasterize a few times a second, blit the cached panel otherwise
+        if self.overlay_surface is None or now - self.overlay_updated >= self.overlay_interval_ms:
+            if self.overlay_surface is not None:
+                surface_pool.release(self.overlay_surface)
+            self.overlay_surface = self._render_overlay()
+            self.overlay_updated = now
+        return screen.blit(self.overlay_surface, (10, 10))
+
+    def _render_overlay(self):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 24)
+        lines = [f"{'scope':<10}{'p50':>8}{'p95':>8}{'p99':>8}  ms"]
+        for name in self.order:
+            p50, p95, p99 = self.percentiles(name)
+            lines.append(f"{name:<10}{p50:>8.2f}{p95:>8.2f}{p99:>8.2f}")
+        line_h = self.font.get_linesize()
+        surfaces = [self.font.render(line, True, (230, 255, 230)) for line in lines]
+        width = max(s.get_width() for s in surfaces) + 16
+        panel = surface_pool.acquire((width, line_h * len(lines) + 12), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, surf in enumerate(surfaces):
+            panel.blit(surf, (8, 6 + i * line_h))
+        return panel
+
+    # --- Export ---
+
+    def export_chrome_trace(self, path):
+        # Chrome trace-event JSON (chrome://tracing, Perfetto): complete events in µs
+        origin = self.origin_ns
+        events = [{"name": name, "ph": "X", "ts": (start - origin) / 1000, "dur": duration / 1000,
+                   "pid": 1, "tid": 1}
+                  for name, start, duration in self.trace_events()]
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+profiler = Profiler()
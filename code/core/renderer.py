@@ -0,0 +1,47 @@
+import pygame
+from .settings import RENDER_MODE
+
+class FrameRenderer:
+    # Pushes the frame to the display. In "dirty" mode only the regions
+    # marked this frame and last frame (where sprites used to be) are
+    # updated; anything that moves the whole picture, like a background
+    # scroll or a state change, calls invalidate() for a full update.
+    MODES = ("full", "dirty")
+
+    def __init__(self, mode=RENDER_MODE):
+        if mode not in self.MODES:
+            raise ValueError(f"unknown render mode {mode!r}, expected one of {self.MODES}")
+        self.mode = mode
+        # Lists are swapped and cleared rather than rebuilt each frame
+        self.rects = []
+        self.prev_rects = []
+        self.update_rects = []
+        self.full = True
+
+    @property
+    def needs_redraw(self):
+        # False when the previous frame is still valid on screen
+        return self.mode == "full" or self.full
+
+    def invalidate(self):
+        self.full = True
+
+    def mark(self, rect):
+        if rect:
+            self.rects.append(rect)
+
+    def mark_all(self, rects):
+        self.rects.extend(rects)
+
+    def present(self):
+        if self.mode == "full" or self.full:
+            pygame.display.update()
+        elif self.rects or self.prev_rects:
+            update_rects = self.update_rects
+            update_rects.extend(self.prev_rects)
+            update_rects.extend(self.rects)
+            pygame.display.update(update_rects)
+            update_rects.clear()
+        self.prev_rects, self.rects = self.rects, self.prev_rects
+        self.rects.clear()
+        self.full = False
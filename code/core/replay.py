@@ -0,0 +1,126 @@
+import os
+import struct
+import sys
+import time
+from .simulation import GameSim, SIM_STEP_MS
+from .scheduler import SIM_KEYS, STATIC_SCHEDULE
+
+# Binary replay: fixed header, the spawn schedule, then one input byte per
+# tick (key bits plus the scheduler's backoff level). The seed, difficulty
+# and schedule are all GameSim needs to rebuild the exact obstacle stream,
+# so a replay is a few KB per minute of play.
+MAGIC = b"ARRP"
+VERSION = 2
+# magic, version, flags, spawn_rate, speed_min, speed_max, seed, ticks, score
+HEADER = struct.Struct("<4sBBIHHQII")
+# Version 2+: ramp_every, interval_factor, min_interval_ms, speed_step, max_speed, backoff_factor
+SCHEDULE = struct.Struct("<IdIdHd")
+FLAG_PRECISE = 1
+
+class Replay:
+    def __init__(self, seed, settings, precise=False, inputs=b"", score=0, schedule=None):
+        self.seed = seed
+        self.settings = {"spawn_rate": settings["spawn_rate"], "speed_range": list(settings["speed_range"])}
+        # Version 1 replays predate the scheduler and spawn at a fixed cadence
+        self.schedule = dict(schedule if schedule is not None else STATIC_SCHEDULE)
+        self.precise = precise
+        self.inputs = bytearray(inputs)
+        self.score = score
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def record(self, mask):
+        self.inputs.append(mask)
+
+    def to_bytes(self):
+        speed_min, speed_max = self.settings["speed_range"]
+        header = HEADER.pack(MAGIC, VERSION, FLAG_PRECISE if self.precise else 0,
+                             self.settings["spawn_rate"], speed_min, speed_max,
+                             self.seed, len(self.inputs), self.score)
+        schedule = SCHEDULE.pack(*(self.schedule[key] for key in SIM_KEYS))
+        return header + schedule + bytes(self.inputs)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("replay is truncated")
+        magic, version, flags, spawn_rate, speed_min, speed_max, seed, ticks, score = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a replay file")
+        if version not in (1, VERSION):
+            raise ValueError(f"unsupported replay version {version}")
+        offset = HEADER.size
+        schedule = None
+        if version >= 2:
+            if len(data) < offset + SCHEDULE.size:
+                raise ValueError("replay is truncated")
+            schedule = dict(zip(SIM_KEYS, SCHEDULE.unpack_from(data, offset)))
+            offset += SCHEDULE.size
+        inputs = data[offset:offset + ticks]
+        if len(inputs) != ticks:
+            raise ValueError("replay is truncated")
+        settings = {"spawn_rate": spawn_rate, "speed_range": [speed_min, speed_max]}
+        return cls(seed, settings, bool(flags & FLAG_PRECISE), inputs, score, schedule)
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+def start_recording(sim):
+    # Call right after sim.reset(); every following tick is recorded
+    sim.recorder = Replay(sim.seed, sim.settings, sim.precise, schedule=sim.scheduler.schedule)
+    return sim.recorder
+
+def finish_recording(sim):
+    replay = sim.recorder
+    sim.recorder = None
+    if replay is not None:
+        replay.score = sim.score
+    return replay
+
+def play(replay, sim=None):
+    # Re-run a replay as fast as possible, no rendering; returns the sim
+    if sim is None:
+        sim = GameSim(replay.settings, replay.precise, replay.seed, replay.schedule)
+    else:
+        sim.settings = replay.settings
+        sim.schedule = replay.schedule
+        sim.precise = replay.precise
+        sim.reset(replay.seed)
+    sim.recorder = None
+    tick = sim.tick
+    for mask in replay.inputs:
+        tick(mask)
+    return sim
+
+def main(argv=None):
+    # python -m core.replay <file>... : re-simulate and check the recorded score
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from .assets import game_assets
+    game_assets.load()
+
+    paths = sys.argv[1:] if argv is None else argv
+    failed = 0
+    for path in paths:
+        replay = Replay.load(path)
+        start = time.perf_counter()
+        sim = play(replay)
+        elapsed = time.perf_counter() - start
+        speedup = len(replay) * SIM_STEP_MS / 1000 / max(elapsed, 1e-9)
+        status = "ok" if sim.score == replay.score else "MISMATCH"
+        failed += status != "ok"
+        print(f"{path}: {len(replay)} ticks, score {sim.score} (recorded {replay.score}), "
+              f"{speedup:.0f}x real time, {status}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import logging
+from .settings import SPAWN_SCHEDULE
+
+log = logging.getLogger(__name__)
+
+# Backoff level travels in the upper bits of each tick's input byte (the
+# key bits are the low three), so a replay carries the exact backoff the
+# live game ran with and re-simulates the same obstacle stream.
+BACKOFF_SHIFT = 3
+MAX_BACKOFF = 0xFF >> BACKOFF_SHIFT
+
+# Simulation-side parameters; the frame budget ones only matter live
+SIM_KEYS = ("ramp_every", "interval_factor", "min_interval_ms", "speed_step", "max_speed", "backoff_factor")
+
+# Fixed cadence from the difficulty settings (no ramp, backoff ignored)
+STATIC_SCHEDULE = {"ramp_every": 0, "interval_factor": 1.0, "min_interval_ms": 0,
+                   "speed_step": 0.0, "max_speed": 0, "backoff_factor": 1.0}
+
+def backoff_bits(level):
+    return min(level, MAX_BACKOFF) << BACKOFF_SHIFT
+
+class SpawnScheduler:
+    # Spawn cadence on simulation time. Every `ramp_every` points of score
+    # is a difficulty level: the spawn interval shrinks by interval_factor
+    # (down to min_interval_ms) and the speed range shifts up by
+    # speed_step (capped at max_speed). Each backoff level stretches the
+    # interval by backoff_factor, thinning obstacles when the machine
+    # can't keep up. Changes are logged for auditing the tuning.
+    def __init__(self, base, schedule=None):
+        # Passed to create_obstacle; updated in place when the level changes
+        self.settings = {"spawn_rate": 0, "speed_range": [0, 0]}
+        self.reset(base, schedule)
+
+    def reset(self, base, schedule=None):
+        self.schedule = {key: (schedule or SPAWN_SCHEDULE)[key] for key in SIM_KEYS}
+        self.base_interval = base["spawn_rate"]
+        self.base_speed = tuple(base["speed_range"])
+        self.level = 0
+        self.backoff = 0
+        self.timer = 0.0
+        self._apply()
+
+    def rebase(self, base, schedule=None):
+        # New difficulty / schedule mid-run: keeps the level, backoff and
+        # timer, recomputes interval and speed range
+        self.schedule = {key: (schedule or SPAWN_SCHEDULE)[key] for key in SIM_KEYS}
+        self.base_interval = base["spawn_rate"]
+        self.base_speed = tuple(base["speed_range"])
+        self._apply()
+
+    def _apply(self):
+        schedule = self.schedule
+        interval = self.base_interval
+        speed_min, speed_max = self.base_speed
+        if self.level:
+            floor = min(schedule["min_interval_ms"], interval)
+            interval = max(floor, interval * schedule["interval_factor"] ** self.level)
+            bonus = int(self.level * schedule["speed_step"])
+            cap = max(schedule["max_speed"], speed_max)
+            speed_min = min(speed_min + bonus, cap)
+            speed_max = min(speed_max + bonus, cap)
+        if self.backoff:
+            interval *= schedule["backoff_factor"] ** self.backoff
+        self.interval = interval
+        self.settings["spawn_rate"] = interval
+        self.settings["speed_range"][:] = (speed_min, speed_max)
+
+    def tick(self, dt_ms, score, backoff=0):
+        # Advance one simulation step; returns True when an obstacle is due
+        self.retune(score, backoff)
+        self.timer += dt_ms
+        if self.timer >= self.interval:
+            self.timer -= self.interval
+            return True
+        return False
+
+    def retune(self, score, backoff=0):
+        # Moves to the level for `score` and the given backoff; returns True
+        # when the interval or speed range changed
+        ramp_every = self.schedule["ramp_every"]
+        level = score // ramp_every if ramp_every else 0
+        if self.schedule["backoff_factor"] == 1.0:
+            backoff = 0
+        if level == self.level and backoff == self.backoff:
+            return False
+        reason = "score" if level != self.level else "frame budget"
+        before = (self.interval, tuple(self.settings["speed_range"]))
+        self.level = level
+        self.backoff = backoff
+        self._apply()
+        # Past the caps a new level changes nothing; only log real changes
+        if (self.interval, tuple(self.settings["speed_range"])) == before:
+            return False
+        log.info("spawn schedule (%s): score %d, level %d, backoff %d -> every %.0f ms, speed %d-%d",
+                 reason, score, level, backoff, self.interval, *self.settings["speed_range"])
+        return True
+
+class FrameBudget:
+    # Live side of the backoff: turns measured frame work time (excluding
+    # the frame-cap sleep) into a backoff level with hysteresis. The level
+    # goes up after over_budget_frames consecutive frames over budget and
+    # back down after recover_frames consecutive frames comfortably under.
+    RECOVER_RATIO = 0.75
+
+    def __init__(self, schedule=None):
+        self.level = 0
+        self.over = 0
+        self.under = 0
+        self.configure(schedule)
+
+    def configure(self, schedule=None):
+        schedule = schedule or SPAWN_SCHEDULE
+        self.budget_ms = schedule["frame_budget_ms"]
+        self.max_level = min(schedule["max_backoff"], MAX_BACKOFF)
+        self.over_frames = schedule["over_budget_frames"]
+        self.recover_frames = schedule["recover_frames"]
+        self.level = min(self.level, self.max_level)
+
+    def observe(self, work_ms):
+        if work_ms > self.budget_ms:
+            self.over += 1
+            self.under = 0
+        elif work_ms < self.budget_ms * self.RECOVER_RATIO:
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = self.under = 0
+
+        if self.over >= self.over_frames and self.level < self.max_level:
+            self.level += 1
+            self.over = 0
+            log.info("frame budget: %d frames over %.1f ms (last %.1f ms), backoff -> %d",
+                     self.over_frames, self.budget_ms, work_ms, self.level)
+        elif self.under >= self.recover_frames and self.level > 0:
+            self.level -= 1
+            self.under = 0
+            log.info("frame budget: %d frames under %.1f ms, backoff -> %d",
+                     self.recover_frames, self.budget_ms * self.RECOVER_RATIO, self.level)
+        return self.level
+
+    def bits(self):
+        return backoff_bits(self.level)
@@ -20,6 +20,29 @@ DIFFICULTY = CONFIG['difficulty']
 DIFFICULTY_SETTINGS = CONFIG['difficulty_settings']
 CURRENT_SETTINGS = DIFFICULTY_SETTINGS[DIFFICULTY]
 
+# Spawn scheduler: difficulty ramp by score (ramp_every 0 turns it off) and
+# frame-budget backoff (max_backoff 0 turns it off)
+SPAWN_SCHEDULE = {
+    'ramp_every': 100,
+    'interval_factor': 0.92,
+    'min_interval_ms': 600,
+    'speed_step': 0.5,
+    'max_speed': 14,
+    'frame_budget_ms': 1000 / 60,
+    'backoff_factor': 1.25,
+    'max_backoff': 4,
+    'over_budget_frames': 30,
+    'recover_frames': 180,
+    **CONFIG.get('spawn_schedule', {}),
+}
+
+# Obstacle archetypes: name -> sprite, size, spawn rule, velocity model,
+# spawn weight and score (compiled into lookup tables by core.obstacles)
+OBSTACLE_ARCHETYPES = CONFIG['obstacles']
+
+# Pixel-perfect mask test after a rect hit (rect-only when false)
+PRECISE_COLLISION = CONFIG.get('precise_collision', False)
+
 RISE_SPEED = CONFIG['physics']['rise_speed']
 FALL_SPEED = CONFIG['physics']['fall_speed']
 ANIMATION_SPEED = CONFIG['physics'].get('animation_speed', 120)
@@ -38,3 +61,56 @@ ROLL_SPEED = 20
 ROLL_FRAME_DURATION = 85
 
 ASSETS_PATH = os.path.join(BASE_DIR, CONFIG['assets_path'])
+# Pre-scaled raw pixel bundle built from the assets (empty to load images directly)
+ASSET_BUNDLE_PATH = os.path.join(BASE_DIR, CONFIG['asset_bundle']) if CONFIG.get('asset_bundle') else None
+
+# Rendering: "full" pushes the whole window each frame, "dirty" only changed regions
+RENDER_MODE = CONFIG.get('render', {}).get('mode', 'full')
+# Parallax background, back to front. Layer: name, sprite, mode (opaque,
+# colorkey, alpha), factor (scroll speed relative to the ground), size
+# (default full screen) and y. Drawn in tile_width-wide tiles.
+BACKGROUND_LAYERS = CONFIG.get('background', {}).get('layers', [
+    {'name': 'background', 'sprite': 'background.jpg', 'mode': 'opaque', 'factor': 1.0},
+])
+BACKGROUND_TILE_WIDTH = CONFIG.get('background', {}).get('tile_width', 128)
+
+# Frame pacing: refresh target (60, 120, 144 or 0 for uncapped) and how the
+# wait is done (sleep, busy, hybrid, vsync); see core/pacing.py
+PACING = {
+    'target_fps': 60,
+    'mode': 'hybrid',
+    'spin_ms': 2.0,
+    **CONFIG.get('pacing', {}),
+}
+
+# Frame-phase profiler (F3 toggles the overlay, F4 writes a Chrome trace)
+PROFILER_ENABLED = CONFIG.get('profiler', {}).get('enabled', False)
+PROFILER_TRACE_PATH = os.path.join(BASE_DIR, CONFIG.get('profiler', {}).get('trace_path', '../traces/trace.json'))
+
+# Music crossfade and the pooled sound-effect channels (effects: name -> file in assets)
+AUDIO_SETTINGS = {
+    'crossfade_ms': 600,
+    'sfx_channels': 6,
+    'effects': {},
+    **CONFIG.get('audio', {}),
+}
+
+# Append-only session telemetry log (empty to disable)
+TELEMETRY_PATH = os.path.join(BASE_DIR, CONFIG['telemetry_path']) if CONFIG.get('telemetry_path') else None
+
+# Local leaderboard database (empty to disable)
+LEADERBOARD_PATH = os.path.join(BASE_DIR, CONFIG['leaderboard_path']) if CONFIG.get('leaderboard_path') else None
+
+# Ghost racing (see core/net.py): server host (empty to play solo), port,
+# state updates per second, and the lobby wait before a race starts
+MULTIPLAYER = {
+    'server': '',
+    'port': 7777,
+    'send_hz': 30,
+    'start_delay_s': 2.0,
+    'ghost_alpha': 110,
+    **CONFIG.get('multiplayer', {}),
+}
+
+# Replay of the last finished run (empty to disable)
+REPLAY_PATH = os.path.join(BASE_DIR, CONFIG['replay_path']) if CONFIG.get('replay_path') else None
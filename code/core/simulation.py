@@ -0,0 +1,167 @@
+import logging
+import random
+import pygame
+from .settings import CURRENT_SETTINGS, PRECISE_COLLISION
+from .config import config_service
+from .player import Player
+from .background import Background
+from .obstacles import ObstacleStore, create_obstacle, move_obstacles
+from .collision import check_collision
+from .scheduler import SpawnScheduler, BACKOFF_SHIFT
+from .profiler import profiler
+from .telemetry import SPAWN, PLAYER_STATE, COLLISION, SESSION_END, STATE_IDS
+
+log = logging.getLogger(__name__)
+
+# The simulation advances in fixed steps regardless of the render rate.
+# Physics constants in config.json are tuned per 60 Hz frame.
+SIM_STEP_MS = 1000.0 / 60
+# Cap catch-up work after a long hitch (window drag, disk stall, ...)
+MAX_STEPS_PER_CALL = 8
+
+ROLL_SCROLL_BOOST = 10 # Uniform 10px shift for world "moving around player"
+
+# Input bitmask (one bit per game key; the bits from BACKOFF_SHIFT up carry
+# the spawn scheduler's frame-budget backoff level)
+INPUT_UP = 1
+INPUT_RIGHT = 2
+INPUT_LEFT = 4
+
+KEY_BITS = {
+    pygame.K_UP: INPUT_UP,
+    pygame.K_RIGHT: INPUT_RIGHT,
+    pygame.K_LEFT: INPUT_LEFT,
+}
+
+def inputs_from_keys(keys):
+    mask = 0
+    for key, bit in KEY_BITS.items():
+        if keys[key]:
+            mask |= bit
+    return mask
+
+class InputState:
+    # Stand-in for pygame.key.get_pressed() driven by an input bitmask
+    __slots__ = ("mask",)
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return bool(self.mask & KEY_BITS.get(key, 0))
+
+class GameSim:
+    # Headless game logic: no display, no event queue, no wall clock.
+    def __init__(self, settings=None, precise=PRECISE_COLLISION, seed=None, schedule=None):
+        self.settings = settings if settings is not None else CURRENT_SETTINGS
+        self.schedule = schedule # Spawn schedule parameters (None: config.json)
+        self.precise = precise
+        self.rng = random.Random()
+        self.recorder = None # Optional Replay that receives every tick's inputs
+        self.telemetry = None # Optional TelemetryLog for spawns, state changes, collisions
+        self.player = Player()
+        self.background = Background()
+        self.keys = InputState()
+        self.obstacles = ObstacleStore()
+        self.scheduler = SpawnScheduler(self.settings, schedule)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        # Every session is seeded so it can be replayed; draw a fresh seed unless given one
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.rng.seed(self.seed)
+        self.tick_count = 0
+        self.time_ms = 0.0
+        self.accumulator = 0.0
+        self.scheduler.reset(self.settings, self.schedule)
+        self.spawn_count = 0
+        self.obstacles.clear()
+        self.score = 0
+        self.game_over = False
+        self.player.reset(self.time_ms)
+        self.player_surf = None
+        self.player_rect = None
+        if self.telemetry is not None:
+            self.telemetry.session_start(self)
+
+    def retune(self, tuning):
+        # Live config change (ConfigService listener): the difficulty and
+        # schedule switch mid-run, keeping the score level and spawn timer.
+        # A run recorded up to here can't be re-simulated any more.
+        self.settings = tuning.settings
+        self.schedule = tuning.schedule
+        self.scheduler.rebase(self.settings, self.schedule)
+        if self.recorder is not None:
+            self.recorder = None
+            log.info("config changed mid-run; this run won't be saved as a replay")
+
+    @property
+    def alpha(self):
+        # Fraction of a step left in the accumulator, used by the renderer to interpolate
+        return min(self.accumulator / SIM_STEP_MS, 1.0)
+
+    def step(self, inputs, dt_ms):
+        # Run as many fixed ticks as the elapsed time allows; returns ticks run
+        self.accumulator += dt_ms
+        steps = 0
+        while self.accumulator >= SIM_STEP_MS and not self.game_over:
+            if steps >= MAX_STEPS_PER_CALL:
+                self.accumulator = 0.0
+                break
+            self.tick(inputs)
+            self.accumulator -= SIM_STEP_MS
+            steps += 1
+
+        if self.game_over:
+            self.accumulator = 0.0
+        return steps
+
+    def tick(self, inputs):
+        if self.game_over:
+            return
+        if self.recorder is not None:
+            self.recorder.record(inputs)
+        self.tick_count += 1
+        self.time_ms = self.tick_count * SIM_STEP_MS
+        player = self.player
+
+        # 1. Spawning (scheduler on simulation time, ramps with the score)
+        if self.scheduler.tick(SIM_STEP_MS, self.score, inputs >> BACKOFF_SHIFT):
+            target_x = player.rect.centerx if player.rect else player.x_position
+            slot = create_obstacle(self.obstacles, target_x, self.rng, self.scheduler.settings)
+            self.spawn_count += 1
+            if self.telemetry is not None:
+                obstacles = self.obstacles
+                self.telemetry.emit(SPAWN, self.tick_count, obstacles.type_id[slot], obstacles.vx[slot],
+                                    obstacles.vy[slot], obstacles.x[slot], obstacles.y[slot])
+
+        # 2. Player Update (Determine State)
+        self.keys.mask = inputs
+        state = player.state
+        with profiler.scope("player"):
+            self.player_surf, self.player_rect = player.update(self.keys, self.time_ms)
+        if player.state != state and self.telemetry is not None:
+            self.telemetry.emit(PLAYER_STATE, self.tick_count, STATE_IDS[player.state])
+
+        # 3. Calculate Scroll Boost for Rolling Effect
+        scroll_boost = 0
+        if player.state == "roll":
+            scroll_boost = ROLL_SCROLL_BOOST
+        elif player.state == "jump":
+            scroll_boost = config_service.tuning.jump_horizontal_speed
+
+        # 4. Background Update
+        with profiler.scope("background"):
+            self.background.update(scroll_boost)
+
+        # 5. Obstacle Update
+        with profiler.scope("obstacles"):
+            self.score += move_obstacles(self.obstacles, scroll_boost)
+
+        # 6. Collision
+        with profiler.scope("collision"):
+            if self.player_rect and check_collision(player, self.obstacles, precise=self.precise):
+                self.game_over = True
+                if self.telemetry is not None:
+                    self.telemetry.emit(COLLISION, self.tick_count, self.score)
+                    self.telemetry.emit(SESSION_END, self.tick_count, self.score)
@@ -0,0 +1,259 @@
+import glob
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+from collections import Counter, namedtuple
+from .settings import SPAWN_SCHEDULE
+
+# Session telemetry: an append-only binary event log. Each file starts
+# with a short header; after it every record is
+#   u16 body length, u8 kind, body
+# so readers can skip kinds they don't know and stop cleanly at a
+# truncated tail (a cabinet losing power mid-write loses one batch at
+# most). Sessions append to the same file; a torn tail is cut off before
+# the next session appends.
+#
+# The game loop only packs records into the current batch; full batches
+# go through a bounded queue to a writer thread that does all the disk
+# I/O. If the writer falls behind, batches are dropped (and counted)
+# rather than ever blocking a frame.
+MAGIC = b"ARTL"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sB")
+RECORD_HEADER = struct.Struct("<HB")
+
+# kind -> (name, body struct, fields)
+SESSION_START = 1 # seed, spawn_rate, speed_min, speed_max, unix time (s)
+SPAWN = 2 # tick, type id, velocity x/y, position x/y
+PLAYER_STATE = 3 # tick, state id
+COLLISION = 4 # tick, score
+PAUSE = 5 # tick, 1 paused / 0 resumed
+FRAME = 6 # frame time, work time (ms)
+SESSION_END = 7 # tick, score
+KINDS = {
+    SESSION_START: ("session_start", struct.Struct("<QdHHd"), "seed spawn_rate speed_min speed_max time"),
+    SPAWN: ("spawn", struct.Struct("<Ibffff"), "tick type_id vx vy x y"),
+    PLAYER_STATE: ("player_state", struct.Struct("<IB"), "tick state"),
+    COLLISION: ("collision", struct.Struct("<II"), "tick score"),
+    PAUSE: ("pause", struct.Struct("<IB"), "tick paused"),
+    FRAME: ("frame", struct.Struct("<ff"), "frame_ms work_ms"),
+    SESSION_END: ("session_end", struct.Struct("<II"), "tick score"),
+}
+# Whole record (header + body) per kind, packed in one call
+RECORDS = {kind: struct.Struct("<HB" + body.format[1:]) for kind, (_, body, _) in KINDS.items()}
+EVENTS = {kind: namedtuple(name.title().replace("_", ""), fields) for kind, (name, _, fields) in KINDS.items()}
+
+# Player states as stored in PLAYER_STATE records
+PLAYER_STATES = ("idle", "ready", "run", "roll", "jump", "stop")
+STATE_IDS = {name: i for i, name in enumerate(PLAYER_STATES)}
+
+class TelemetryLog:
+    def __init__(self, path, batch_records=512, max_batches=64):
+        self.path = path
+        self.batch_records = batch_records
+        self.batch = []
+        self.queue = queue.Queue(maxsize=max_batches)
+        self.dropped = 0 # Records lost to a full queue
+        self.records = 0
+        self.closed = False
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.writer = threading.Thread(target=self._write, name="telemetry-writer", daemon=True)
+        self.writer.start()
+
+    # --- Game loop side ---
+
+    def emit(self, kind, *values):
+        record = RECORDS[kind]
+        self.batch.append(record.pack(record.size - RECORD_HEADER.size, kind, *values))
+        if len(self.batch) >= self.batch_records:
+            self.flush()
+
+    def flush(self):
+        # Hands the current batch to the writer; never waits
+        if not self.batch:
+            return
+        batch, self.batch = self.batch, []
+        try:
+            self.queue.put_nowait(batch)
+            self.records += len(batch)
+        except queue.Full:
+            self.dropped += len(batch)
+
+    def session_start(self, sim):
+        speed_min, speed_max = sim.settings["speed_range"]
+        self.emit(SESSION_START, sim.seed, sim.settings["spawn_rate"], speed_min, speed_max, time.time())
+
+    def close(self):
+        # Flushes what's left and waits for the writer to finish
+        if self.closed:
+            return
+        self.closed = True
+        self.flush()
+        self.queue.put(None)
+        self.writer.join()
+
+    # --- Writer thread ---
+
+    def _write(self):
+        with open(self.path, "ab") as f:
+            if f.tell() == 0:
+                f.write(FILE_HEADER.pack(MAGIC, VERSION))
+            else:
+                complete = _complete_length(self.path)
+                if complete < f.tell():
+                    f.truncate(complete)
+                    f.seek(complete)
+            while True:
+                batch = self.queue.get()
+                if batch is None:
+                    break
+                # Drain whatever else is queued into the same write
+                batches = [batch]
+                stop = False
+                while not stop:
+                    try:
+                        more = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if more is None:
+                        stop = True
+                    else:
+                        batches.append(more)
+                f.write(b"".join(b"".join(batch) for batch in batches))
+                f.flush()
+                if stop:
+                    break
+
+# --- Reading: generator pipelines ---
+
+def read_records(path, chunk_size=1 << 16):
+    # Yields (kind, event namedtuple) from one log, streaming in chunks.
+    # Unknown kinds are skipped; a truncated last record ends the stream.
+    with open(path, "rb") as f:
+        header = f.read(FILE_HEADER.size)
+        if len(header) < FILE_HEADER.size:
+            return
+        magic, version = FILE_HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a telemetry log")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported telemetry version {version}")
+        buffer = b""
+        offset = 0
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            buffer = buffer[offset:] + chunk
+            offset = 0
+            end = len(buffer)
+            while end - offset >= RECORD_HEADER.size:
+                length, kind = RECORD_HEADER.unpack_from(buffer, offset)
+                start = offset + RECORD_HEADER.size
+                if end - start < length:
+                    break
+                spec = KINDS.get(kind)
+                if spec is not None and spec[1].size == length:
+                    yield kind, EVENTS[kind]._make(spec[1].unpack_from(buffer, start))
+                offset = start + length
+
+def _complete_length(path, chunk_size=1 << 16):
+    # Byte length of the log up to its last complete record
+    with open(path, "rb") as f:
+        f.seek(FILE_HEADER.size)
+        position = FILE_HEADER.size # File offset of the next record
+        pending = b""
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return position
+            pending += chunk
+            offset = 0
+            while len(pending) - offset >= RECORD_HEADER.size:
+                length, _ = RECORD_HEADER.unpack_from(pending, offset)
+                if len(pending) - offset - RECORD_HEADER.size < length:
+                    break
+                offset += RECORD_HEADER.size + length
+            position += offset
+            pending = pending[offset:]
+
+def log_paths(paths):
+    # Files and directories (every *.artl inside, recursively)
+    for path in paths:
+        if os.path.isdir(path):
+            yield from sorted(glob.glob(os.path.join(path, "**", "*.artl"), recursive=True))
+        else:
+            yield path
+
+def records(paths):
+    for path in log_paths(paths):
+        yield from read_records(path)
+
+def sessions(stream):
+    # Groups a record stream into sessions: yields lists of (kind, event),
+    # each starting with its SESSION_START (records before the first are dropped)
+    current = None
+    for kind, event in stream:
+        if kind == SESSION_START:
+            if current:
+                yield current
+            current = [(kind, event)]
+        elif current is not None:
+            current.append((kind, event))
+    if current:
+        yield current
+
+def of_kind(stream, kind):
+    return (event for k, event in stream if k == kind)
+
+def summarize(stream):
+    # One pass over any number of logs
+    summary = {"sessions": 0, "finished": 0, "ticks": 0, "scores": [], "spawns": Counter(),
+               "states": Counter(), "pauses": 0, "frames": 0, "frame_ms": 0.0, "slow_frames": 0}
+    for session in sessions(stream):
+        summary["sessions"] += 1
+        for kind, event in session:
+            if kind == SPAWN:
+                summary["spawns"][event.type_id] += 1
+            elif kind == PLAYER_STATE:
+                summary["states"][event.state] += 1
+            elif kind == PAUSE:
+                summary["pauses"] += event.paused
+            elif kind == FRAME:
+                summary["frames"] += 1
+                summary["frame_ms"] += event.frame_ms
+                summary["slow_frames"] += event.work_ms > SPAWN_SCHEDULE["frame_budget_ms"]
+            elif kind == SESSION_END:
+                summary["finished"] += 1
+                summary["ticks"] += event.tick
+                summary["scores"].append(event.score)
+    return summary
+
+def main(argv=None):
+    # python -m core.telemetry <log or directory>... : aggregate sessions
+    from .obstacles import OBSTACLE_TYPES
+    paths = sys.argv[1:] if argv is None else argv
+    summary = summarize(records(paths))
+    scores = sorted(summary["scores"])
+    print(f"{summary['sessions']} sessions, {summary['finished']} finished, "
+          f"{summary['ticks'] / 60 / 60:.1f} minutes played")
+    if scores:
+        print(f"score: mean {sum(scores) / len(scores):.1f}, median {scores[len(scores) // 2]}, best {scores[-1]}")
+    total = sum(summary["spawns"].values())
+    for type_id, count in sorted(summary["spawns"].items()):
+        name = OBSTACLE_TYPES.names[type_id] if type_id < len(OBSTACLE_TYPES) else f"type {type_id}"
+        print(f"  spawned {name:<10} {count:>8} ({count / total:.0%})")
+    for state, count in sorted(summary["states"].items()):
+        print(f"  entered {PLAYER_STATES[state]:<10} {count:>8}")
+    if summary["frames"]:
+        print(f"frames: {summary['frames']}, mean {summary['frame_ms'] / summary['frames']:.2f} ms, "
+              f"{summary['slow_frames']} over budget; pauses: {summary['pauses']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
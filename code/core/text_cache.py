@@ -0,0 +1,67 @@
+import pygame
+from collections import OrderedDict
+
+class TextCache:
+    # Rendered text surfaces keyed by (font, size, text, color, antialias),
+    # evicting the least recently used entry once full.
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+
+    def font(self, size, font_name=None):
+        key = (font_name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self.fonts[key] = pygame.font.Font(font_name, size)
+        return font
+
+    def render(self, text, size, color, antialias=True, font_name=None):
+        key = (font_name, size, text, tuple(color), antialias)
+        surfaces = self.surfaces
+        surf = surfaces.get(key)
+        if surf is not None:
+            surfaces.move_to_end(key)
+            return surf
+        surf = surfaces[key] = self.font(size, font_name).render(text, antialias, color)
+        if len(surfaces) > self.max_entries:
+            surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self.surfaces.clear()
+
+text_cache = TextCache()
+
+class DigitAtlas:
+    # Counter renderer for frequently changing numbers: the prefix and the
+    # ten digit glyphs are rasterized once, drawing a value is a few blits.
+    def __init__(self, size, color, prefix="", antialias=True, font_name=None):
+        font = text_cache.font(size, font_name)
+        self.prefix = font.render(prefix, antialias, color) if prefix else None
+        self.glyphs = {ch: font.render(ch, antialias, color) for ch in "0123456789-"}
+        self.height = font.get_height()
+        self.prefix_width = self.prefix.get_width() if self.prefix else 0
+
+    def width(self, value):
+        glyphs = self.glyphs
+        return self.prefix_width + sum(glyphs[ch].get_width() for ch in str(value))
+
+    def draw(self, screen, value, center):
+        # Returns the screen area drawn
+        text = str(value)
+        width = self.width(text)
+        x = int(center[0] - width / 2)
+        y = int(center[1] - self.height / 2)
+        area = pygame.Rect(x, y, width, self.height)
+        if self.prefix:
+            screen.blit(self.prefix, (x, y))
+            x += self.prefix_width
+        glyphs = self.glyphs
+        for ch in text:
+            glyph = glyphs[ch]
+            screen.blit(glyph, (x, y))
+            x += glyph.get_width()
+        return area
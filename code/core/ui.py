@@ -1,20 +1,20 @@
 import pygame
 from .settings import SCREEN_WIDTH, SCREEN_HEIGHT, X_POSITION, GROUND_Y
 from .assets import game_assets
+from .text_cache import text_cache, DigitAtlas
 
 class UI:
     def __init__(self):
         # Ensure font module is initialized if not already (pygame.init handles it)
         if not pygame.font.get_init():
             pygame.font.init()
-        self.font = pygame.font.Font(None, 50)
+        self.font_size = 50
         self.score_color = (64, 64, 64)
         self.msg_color = (111, 196, 169)
+        self.score_atlas = DigitAtlas(self.font_size, self.score_color, 'Score: ')
 
     def draw_score(self, screen, score):
-        score_surf = self.font.render(f'Score: {score}', True, self.score_color)
-        score_rect = score_surf.get_rect(center=(SCREEN_WIDTH/2, 50))
-        screen.blit(score_surf, score_rect)
+        return self.score_atlas.draw(screen, score, (SCREEN_WIDTH/2, 50))
 
     def draw_start_screen(self, screen):
         # Draw standing player
@@ -22,7 +22,7 @@ class UI:
             mario_rect = game_assets.standing_surface.get_rect(center=(X_POSITION, GROUND_Y))
             screen.blit(game_assets.standing_surface, mario_rect)
         
-        msg = self.font.render('Press Space to Start', True, self.msg_color)
+        msg = text_cache.render('Press Space to Start', self.font_size, self.msg_color)
         msg_rect = msg.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2))
         screen.blit(msg, msg_rect)
 
@@ -31,6 +31,6 @@ class UI:
             mario_rect = game_assets.standing_surface.get_rect(center=(X_POSITION, GROUND_Y))
             screen.blit(game_assets.standing_surface, mario_rect)
         
-        msg = self.font.render(f'Game Over! Score: {score}', True, self.msg_color)
+        msg = text_cache.render(f'Game Over! Score: {score}', self.font_size, self.msg_color)
         msg_rect = msg.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2))
         screen.blit(msg, msg_rect)
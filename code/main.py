@@ -1,57 +1,91 @@
 import pygame
 import sys
 import os
-from core.settings import SCREEN_WIDTH, SCREEN_HEIGHT, CAPTION, CURRENT_SETTINGS, BASE_DIR, JUMP_HORIZONTAL_SPEED
+import time
+import logging
+from core.settings import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, CAPTION, BASE_DIR, ASSETS_PATH, REPLAY_PATH, PROFILER_ENABLED, PROFILER_TRACE_PATH,
+    AUDIO_SETTINGS, PACING, TELEMETRY_PATH, LEADERBOARD_PATH, MULTIPLAYER
+)
+from core.pacing import open_display
+from core.config import config_service
+
+# Spawn scheduler / frame budget decisions are logged for tuning audits
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
 
 # Initialize Pygame
 pygame.init()
 pygame.mixer.init()
 
-CLOCK = pygame.time.Clock()
-SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+# Refresh target and frame wait from the pacing settings
+SCREEN, PACER = open_display((SCREEN_WIDTH, SCREEN_HEIGHT), PACING)
 pygame.display.set_caption(CAPTION)
 
 # Import modules (after pygame init for asset loading dependencies)
 from core.assets import game_assets
-from core.player import Player
-from core.obstacles import create_obstacle, move_obstacles, draw_obstacles
-from core.collision import check_collision
+from core.obstacles import draw_obstacles
+from core.simulation import GameSim, inputs_from_keys
+from core.scheduler import FrameBudget
+from core.replay import start_recording, finish_recording
+from core.telemetry import TelemetryLog, PAUSE, FRAME
+from core.leaderboard import Leaderboard
+from core.net import NetClient
+from core.ghosts import draw_ghosts
 from core.ui import UI
+from core.text_cache import text_cache
+from core.renderer import FrameRenderer
+from core.profiler import profiler
+from core.audio import AudioManager
 from core.intro_ui import IntroUI
 from core.over_ui import GameOverUI
-from core.background import Background
-
-# Load Assets
-game_assets.load()
 
 # Load Audio
-# Basic error handling for missing audio files
+# Missing audio files are skipped; tracks decode on a background thread
 intro_music_path = os.path.join(BASE_DIR, "../assets/intro.mp3")
 game_music_path = os.path.join(BASE_DIR, "../assets/game_audio.mp3")
 
-has_intro_music = os.path.exists(intro_music_path)
-has_game_music = os.path.exists(game_music_path)
+audio = AudioManager(
+    {"intro": intro_music_path, "game": game_music_path},
+    {name: os.path.join(ASSETS_PATH, filename) for name, filename in AUDIO_SETTINGS["effects"].items()},
+    sfx_channels=AUDIO_SETTINGS["sfx_channels"],
+    crossfade_ms=AUDIO_SETTINGS["crossfade_ms"],
+)
+audio.start_loading(first="intro")
 
 def play_music(music_type):
-    if music_type == "intro" and has_intro_music:
-        pygame.mixer.music.load(intro_music_path)
-        pygame.mixer.music.play(-1)
-    elif music_type == "game" and has_game_music:
-        pygame.mixer.music.load(game_music_path)
-        pygame.mixer.music.play(-1)
-    else:
-        pygame.mixer.music.stop()
+    # Non-blocking crossfade; unknown/missing tracks fade the music out
+    audio.play_music(music_type)
 
 # Game Objects
-player = Player()
+sim = GameSim()
 ui = UI()
 intro_ui = IntroUI()
+# Assets load on first use; gameplay sprites stream in behind the intro
+game_assets.prefetch("playing")
 game_over_ui = GameOverUI()
-background = Background()
-obstacle_list = []
-score = 0
+renderer = FrameRenderer()
+# Backs off spawn density when frames run over budget (persists across runs)
+frame_budget = FrameBudget()
+profiler.enable(PROFILER_ENABLED)
+# config.json edits (difficulty, spawn schedule, physics) apply live
+def retune(tuning):
+    # A race keeps the server's settings; local changes apply after it
+    if not racing:
+        sim.retune(tuning)
+config_service.listeners.append(retune)
+config_service.listeners.append(lambda tuning: frame_budget.configure(tuning.schedule))
+config_service.watch()
+# Spawns, state changes and collisions come from the sim; pauses and frame timing from here
+telemetry = TelemetryLog(TELEMETRY_PATH) if TELEMETRY_PATH else None
+sim.telemetry = telemetry
+# Scores are stored and queried on a worker thread; the game over screen reads its cache
+leaderboard = Leaderboard(LEADERBOARD_PATH) if LEADERBOARD_PATH else None
+# Ghost racing: with a server configured, runs are races started by the
+# server and the other players show up as ghosts (solo if it's unreachable)
+net = NetClient(MULTIPLAYER["server"], MULTIPLAYER["port"], MULTIPLAYER["send_hz"]).start() if MULTIPLAYER["server"] else None
+racing = False
 
-# Game States: 'intro', 'playing', 'game_over'
+# Game States: 'intro', 'waiting' (for a race), 'playing', 'game_over'
 game_state = "intro" 
 game_paused = False
 current_music = None
@@ -59,30 +93,78 @@ current_music = None
 play_music("intro")
 current_music = "intro"
 
-SPAWN_OBSTACLE = pygame.USEREVENT + 1
-pygame.time.set_timer(SPAWN_OBSTACLE, CURRENT_SETTINGS["spawn_rate"])
+def start_run(race=None):
+    # A race is played on the server's seed, difficulty and schedule
+    global racing, current_music
+    if race is not None:
+        sim.settings = race.settings
+        sim.schedule = race.schedule
+        sim.reset(race.seed)
+    else:
+        sim.reset()
+    racing = race is not None
+    start_recording(sim)
+    play_music("game")
+    current_music = "game"
+    renderer.invalidate()
+
+def next_run_state():
+    # Online, the player waits for the server's next race; otherwise the run starts now
+    if net and net.online:
+        net.ready()
+        renderer.invalidate()
+        return "waiting"
+    start_run()
+    return "playing"
+
+# Real time elapsed since the previous frame, fed to the fixed-step simulation
+frame_ms = 0
 
 while True:
-    events = pygame.event.get()
-    for event in events:
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        
-        # Global Pause (only if playing)
-        if game_state == "playing":
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
-                game_paused = not game_paused
-                # Pause/Unpause music?
-                if game_paused:
-                    pygame.mixer.music.pause()
-                else:
-                    pygame.mixer.music.unpause()
+    frame_start = time.perf_counter_ns()
+    # Swap in a reloaded config between frames (parsed off-thread)
+    config_service.apply()
+    with profiler.scope("events"):
+        events = pygame.event.get()
+        for event in events:
+            if event.type == pygame.QUIT:
+                if telemetry:
+                    telemetry.close()
+                if leaderboard:
+                    leaderboard.close()
+                if net:
+                    net.close()
+                pygame.quit()
+                sys.exit()
+            
+            # Profiler overlay / trace export
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle_overlay()
+                renderer.invalidate()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                count = profiler.export_chrome_trace(PROFILER_TRACE_PATH)
+                print(f"Wrote {count} trace events to {PROFILER_TRACE_PATH}")
+            
+            # Global Pause (only if playing)
+            if game_state == "playing":
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                    game_paused = not game_paused
+                    renderer.invalidate()
+                    if telemetry:
+                        telemetry.emit(PAUSE, sim.tick_count, game_paused)
+                    # Pause/Unpause music?
+                    if game_paused:
+                        audio.pause()
+                    else:
+                        audio.unpause()
 
     # --- STATE MACHINE ---
     
     if game_state == "intro":
-        intro_ui.draw(SCREEN)
+        # Intro slides animate across the whole window
+        with profiler.scope("draw"):
+            intro_ui.draw(SCREEN)
+        renderer.invalidate()
         
         # Event handling for intro
         for event in events:
@@ -90,69 +172,89 @@ while True:
                 game_state = "playing"
         
         if game_state == "playing":
-             score = 0
-             obstacle_list = []
-             player.reset()
-             play_music("game")
-             current_music = "game"
-             
+             game_assets.prefetch("game_over")
+             game_state = next_run_state()
+
+    elif game_state == "waiting":
+        # Lobby: the world stands still until the server starts the race
+        with profiler.scope("draw"):
+            sim.background.draw(SCREEN)
+            wait_surf = text_cache.render("WAITING FOR RACE...", 60, (255, 255, 255))
+            renderer.mark(SCREEN.blit(wait_surf, wait_surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))))
+        race = net.take_race()
+        if race is not None:
+            start_run(race)
+            game_state = "playing"
+        elif not net.online:
+            start_run()
+            game_state = "playing"
+
     elif game_state == "playing":
         if not game_paused:
-            # 1. Events
-            for event in events:
-                if event.type == SPAWN_OBSTACLE:
-                    target_x = player.rect.centerx if player.rect else player.x_position
-                    obstacle_list.append(create_obstacle(target_x))
-        
-            # 2. Player Update (Determine State)
+            # Spawning, player, background, obstacles and collision all run
+            # inside the fixed-step simulation
             keys = pygame.key.get_pressed()
-            player_surf, player_rect = player.update(keys)
-            
-            # 3. Calculate Scroll Boost for Rolling Effect
-            scroll_boost = 0
-            if player.state == "roll":
-                scroll_boost = 10 # Uniform 10px shift for world "moving around player"
-            elif player.state == "jump":
-                scroll_boost = JUMP_HORIZONTAL_SPEED
-            
-            # 4. Background Update
-            background.update(scroll_boost)
-            
-            # 5. Obstacle Update
-            score_increment = move_obstacles(obstacle_list, scroll_boost)
-            score += score_increment
+            spawned = sim.spawn_count
+            with profiler.scope("update"):
+                # The backoff level rides along in the input byte so replays reproduce it
+                # (races don't back off: every racer needs the same obstacles)
+                sim.step(inputs_from_keys(keys) | (0 if racing else frame_budget.bits()), frame_ms)
+            if racing:
+                net.update(sim.player, sim.tick_count)
+            if sim.spawn_count != spawned:
+                audio.play_effect("spawn")
+            alpha = sim.alpha
             
-            # 6. Collision
-            if player_rect and check_collision(player, obstacle_list):
+            if sim.game_over:
                  game_state = "game_over"
+                 audio.play_effect("collision")
+                 replay = finish_recording(sim)
+                 if REPLAY_PATH and replay is not None:
+                     replay.save(REPLAY_PATH)
+                 if racing:
+                     # Back to the local settings; race scores stay off the local board
+                     net.finish(sim.tick_count, sim.score)
+                     racing = False
+                     sim.retune(config_service.tuning)
+                 elif leaderboard:
+                     leaderboard.submit(sim.score, config_service.tuning.difficulty, sim.tick_count, sim.seed)
                  play_music("intro")
                  current_music = "intro"
+                 renderer.invalidate()
         
         else:
              # Paused Logic
-             player_surf, player_rect = player.get_current_surface(), player.rect
-             font = pygame.font.Font(None, 60)
-             pause_surf = font.render("PAUSED", True, (255, 255, 255))
+             alpha = 1.0
+             pause_surf = text_cache.render("PAUSED", 60, (255, 255, 255))
              pause_rect = pause_surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
 
         # --- DRAWING PHASE ---
-        background.draw(SCREEN)
-        
-        if player_surf and player_rect:
-            SCREEN.blit(player_surf, player_rect)
-            
-        draw_obstacles(SCREEN, obstacle_list)
-        ui.draw_score(SCREEN, score)
-        
-        if game_paused:
-             SCREEN.blit(pause_surf, pause_rect)
+        # While paused the last frame stays valid and nothing is redrawn
+        # (unless the translucent profiler overlay has to be re-layered)
+        if not game_paused or renderer.needs_redraw or profiler.overlay_visible:
+            with profiler.scope("draw"):
+                if sim.background.draw(SCREEN, alpha):
+                    renderer.invalidate() # Scrolling background: whole window changed
+                if racing:
+                    renderer.mark_all(draw_ghosts(SCREEN, net.ghosts.values(), net.interval))
+                renderer.mark(sim.player.draw(SCREEN, alpha))
+                renderer.mark_all(draw_obstacles(SCREEN, sim.obstacles, alpha))
+                renderer.mark(ui.draw_score(SCREEN, sim.score))
+                
+                if game_paused:
+                     renderer.mark(SCREEN.blit(pause_surf, pause_rect))
 
     elif game_state == "game_over":
         # Draw game objects static in background for effect
-        background.draw(SCREEN)
-        # Maybe draw player/obstacles static? Defaults to just background + UI usually looks cleaner
-        
-        game_over_ui.draw(SCREEN, score)
+        with profiler.scope("draw"):
+            sim.background.draw(SCREEN)
+            # Maybe draw player/obstacles static? Defaults to just background + UI usually looks cleaner
+            
+            top = rank = None
+            if leaderboard:
+                top = leaderboard.top(config_service.tuning.difficulty)
+                rank = leaderboard.last_rank
+            renderer.mark_all(game_over_ui.draw(SCREEN, sim.score, top, rank))
         
         for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN:
@@ -162,12 +264,19 @@ while True:
                  game_state = "playing"
         
         if game_state == "playing":
-             score = 0
-             obstacle_list = []
-             player.reset()
-             play_music("game")
-             current_music = "game"
+             game_state = next_run_state()
 
 
-    pygame.display.update()
-    CLOCK.tick(60)
\ No newline at end of file
+    audio.update()
+    renderer.mark(profiler.draw_overlay(SCREEN))
+    with profiler.scope("flip"):
+        renderer.present()
+    frame_end = time.perf_counter_ns()
+    if profiler.enabled:
+        profiler.add("frame", frame_start, frame_end)
+    if game_state == "playing" and not game_paused:
+        # Work time only; the pacing wait below doesn't count against the budget
+        frame_budget.observe((frame_end - frame_start) / 1e6)
+    frame_ms = PACER.tick()
+    if telemetry and game_state == "playing" and not game_paused:
+        telemetry.emit(FRAME, frame_ms, (frame_end - frame_start) / 1e6)
\ No newline at end of file